@@ -1,5 +1,8 @@
 import os
+from contextvars import ContextVar, Token
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 # =============================================================================
 # Directory Exclusion Configuration
@@ -40,6 +43,36 @@ HIDDEN_DIRS = {
 }
 
 
+# Workspace of the agent run in the current context. Set per chat turn instead of
+# os.chdir() so concurrent turns for different projects don't share the process cwd
+_workspace: ContextVar[Optional[Path]] = ContextVar("workspace", default=None)
+
+
+@lru_cache(maxsize=128)
+def _resolve_workspace(cwd: str) -> Path:
+    return Path(cwd).resolve()
+
+
+def set_workspace(path) -> Token:
+    """Set the workspace for tools running in the current context; pass the token to reset_workspace()"""
+    return _workspace.set(_resolve_workspace(str(path)))
+
+
+def reset_workspace(token: Token) -> None:
+    """Restore the workspace that was active before set_workspace()"""
+    _workspace.reset(token)
+
+
 def get_workspace():
-    """Get current workspace dynamically - respects os.chdir() for evaluations"""
-    return Path(os.getcwd()).resolve()
+    """Get current workspace dynamically - the per-run workspace if set, else the process cwd"""
+    workspace = _workspace.get()
+    if workspace is not None:
+        return workspace
+    # Keyed on the cwd string: resolve() stats every path component, and tools call this on every invocation
+    return _resolve_workspace(os.getcwd())
+
+
+def resolve_workspace_path(filepath: str) -> Path:
+    """Resolve a tool path argument: absolute paths as-is, relative ones against the current workspace"""
+    path = Path(filepath)
+    return path if path.is_absolute() else get_workspace() / path
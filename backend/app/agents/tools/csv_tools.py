@@ -5,6 +5,8 @@ CSV File Tools - AutoGen Format
 import logging
 from importlib import util
 
+from app.agents.tools.common import resolve_workspace_path
+
 
 def _check_pandas():
     """Checks if pandas is installed"""
@@ -31,7 +33,7 @@ async def read_csv(filepath: str, delimiter: str = ",", encoding: str = "utf-8",
     try:
         pd = _check_pandas()
 
-        df = pd.read_csv(filepath, delimiter=delimiter, encoding=encoding, nrows=max_rows)
+        df = pd.read_csv(resolve_workspace_path(filepath), delimiter=delimiter, encoding=encoding, nrows=max_rows)
 
         output = f"CSV: {filepath}\n"
         output += f"Rows: {len(df)}, Columns: {len(df.columns)}\n\n"
@@ -66,7 +68,7 @@ async def write_csv(filepath: str, data: str, delimiter: str = ",", mode: str =
     """
     try:
         # Write string directly as CSV
-        with open(filepath, mode, encoding=encoding, newline="") as f:
+        with open(resolve_workspace_path(filepath), mode, encoding=encoding, newline="") as f:
             f.write(data)
             if not data.endswith("\n"):
                 f.write("\n")
@@ -94,7 +96,7 @@ async def csv_info(filepath: str, delimiter: str = ",", encoding: str = "utf-8")
     try:
         pd = _check_pandas()
 
-        df = pd.read_csv(filepath, delimiter=delimiter, encoding=encoding)
+        df = pd.read_csv(resolve_workspace_path(filepath), delimiter=delimiter, encoding=encoding)
 
         output = f"=== Information for {filepath} ===\n\n"
         output += f"Dimensions: {len(df)} rows x {len(df.columns)} columns\n\n"
@@ -143,7 +145,7 @@ async def filter_csv(filepath: str, column: str, value: str, output_file: str =
     try:
         pd = _check_pandas()
 
-        df = pd.read_csv(filepath, delimiter=delimiter)
+        df = pd.read_csv(resolve_workspace_path(filepath), delimiter=delimiter)
 
         if column not in df.columns:
             return f"ERROR: Column '{column}' does not exist. Available columns: {', '.join(df.columns)}"
@@ -155,7 +157,7 @@ async def filter_csv(filepath: str, column: str, value: str, output_file: str =
             return f"No rows found with '{value}' in column '{column}'"
 
         if output_file:
-            filtered_df.to_csv(output_file, index=False, sep=delimiter)
+            filtered_df.to_csv(resolve_workspace_path(output_file), index=False, sep=delimiter)
             return f"✓ {len(filtered_df)} filtered rows saved to {output_file}"
         else:
             output = f"Filtered: {len(filtered_df)} rows with '{value}' in '{column}':\n\n"
@@ -185,8 +187,8 @@ async def merge_csv_files(file1: str, file2: str, output_file: str, on_column: s
     try:
         pd = _check_pandas()
 
-        df1 = pd.read_csv(file1)
-        df2 = pd.read_csv(file2)
+        df1 = pd.read_csv(resolve_workspace_path(file1))
+        df2 = pd.read_csv(resolve_workspace_path(file2))
 
         if on_column:
             # Merge by column
@@ -202,7 +204,7 @@ async def merge_csv_files(file1: str, file2: str, output_file: str, on_column: s
             result = pd.concat([df1, df2], ignore_index=True)
             operation = "concatenation"
 
-        result.to_csv(output_file, index=False)
+        result.to_csv(resolve_workspace_path(output_file), index=False)
 
         return f"✓ Files merged ({operation})\n  Result: {len(result)} rows x {len(result.columns)} columns\n  Saved to: {output_file}"
 
@@ -227,8 +229,8 @@ async def csv_to_json(csv_file: str, json_file: str, orient: str = "records") ->
     try:
         pd = _check_pandas()
 
-        df = pd.read_csv(csv_file)
-        df.to_json(json_file, orient=orient, indent=2)
+        df = pd.read_csv(resolve_workspace_path(csv_file))
+        df.to_json(resolve_workspace_path(json_file), orient=orient, indent=2)
 
         return f"✓ CSV converted to JSON\n  {len(df)} rows exported to {json_file}"
 
@@ -254,7 +256,7 @@ async def sort_csv(filepath: str, column: str, output_file: str = None, ascendin
     try:
         pd = _check_pandas()
 
-        df = pd.read_csv(filepath)
+        df = pd.read_csv(resolve_workspace_path(filepath))
 
         if column not in df.columns:
             return f"ERROR: Column '{column}' does not exist. Columns: {', '.join(df.columns)}"
@@ -262,7 +264,7 @@ async def sort_csv(filepath: str, column: str, output_file: str = None, ascendin
         df_sorted = df.sort_values(by=column, ascending=ascending)
 
         output = output_file or filepath
-        df_sorted.to_csv(output, index=False)
+        df_sorted.to_csv(resolve_workspace_path(output), index=False)
 
         direction = "ascendente" if ascending else "descendente"
         return f"✓ CSV ordenado por '{column}' ({direction})\n  Guardado en: {output}"
@@ -1,4 +1,6 @@
-import os
+from pathlib import Path
+
+from app.agents.tools.common import get_workspace
 
 
 async def delete_file(target_file: str, explanation: str = "") -> str:
@@ -29,8 +31,10 @@ BLOCKED FILES:
 
 These files are for internal agent memory only and must not be deleted from the project."""
 
-        if os.path.exists(target_file):
-            os.remove(target_file)
+        target = get_workspace() / target_file if not Path(target_file).is_absolute() else Path(target_file)
+
+        if target.exists():
+            target.unlink()
             return f"Successfully deleted file: {target_file}"
         else:
             return f"File not found: {target_file}"
@@ -2,10 +2,10 @@
 File System Operations - Smart Edit v2 (With Auto-Correction)
 """
 
-import os
 import re
 from pathlib import Path
 
+from app.agents.tools.common import get_workspace
 from app.utils.linter import lint_code_check
 from app.utils.llm_edit_fixer import _llm_fix_edit
 
@@ -153,7 +153,7 @@ BLOCKED FILES:
 
 These files are for internal agent memory only and must not be edited in the project."""
 
-        workspace = Path(os.getcwd()).resolve()
+        workspace = get_workspace()
         target = workspace / target_file if not Path(target_file).is_absolute() else Path(target_file)
 
         if not target.exists():
@@ -3,7 +3,8 @@ Git Tools for AutoGen - Basic git operations
 """
 
 import asyncio
-import os
+
+from app.agents.tools.common import get_workspace
 
 
 async def git_status(path: str | None = None) -> str:
@@ -16,7 +17,7 @@ async def git_status(path: str | None = None) -> str:
     Returns:
         str: Repository status in readable format
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         # Verify if it's a git repository
@@ -89,7 +90,7 @@ async def git_add(files: str | list[str], path: str | None = None) -> str:
     Returns:
         str: Operation result
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     if isinstance(files, str):
         files = [files]
@@ -125,7 +126,7 @@ async def git_commit(message: str, path: str | None = None) -> str:
     Returns:
         str: Commit result including hash
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         proc = await asyncio.create_subprocess_exec(
@@ -161,7 +162,7 @@ async def git_push(remote: str = "origin", branch: str | None = None, path: str
     Returns:
         str: Push result
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         command = ["git", "push", remote]
@@ -197,7 +198,7 @@ async def git_pull(remote: str = "origin", branch: str | None = None, path: str
     Returns:
         str: Pull result
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         command = ["git", "pull", remote]
@@ -231,7 +232,7 @@ async def git_log(limit: int = 10, path: str | None = None) -> str:
     Returns:
         str: List of recent commits
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         proc = await asyncio.create_subprocess_exec(
@@ -268,7 +269,7 @@ async def git_branch(operation: str = "list", branch_name: str | None = None, pa
     Returns:
         str: Operation result
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         if operation == "list":
@@ -308,7 +309,7 @@ async def git_diff(cached: bool = False, path: str | None = None) -> str:
     Returns:
         str: Diff of changes
     """
-    work_dir = path or os.getcwd()
+    work_dir = path or str(get_workspace())
 
     try:
         command = ["git", "diff"]
@@ -1,6 +1,5 @@
 import glob
 import logging
-import os
 import time
 from pathlib import Path
 from typing import Optional
@@ -16,9 +15,6 @@ MAX_RESULTS_LIMIT = 200  # Safety limit for context window
 # Optional import for pathspec
 import pathspec
 
-WORKSPACE = Path(os.getcwd()).resolve()
-
-
 def _load_gitignore_patterns(root_path: Path) -> Optional["pathspec.PathSpec"]:
     gitignore = root_path / ".gitignore"
     if gitignore.exists():
@@ -39,7 +35,7 @@ def _is_ignored(path: Path, spec: Optional["pathspec.PathSpec"]) -> bool:
     # Check gitignore patterns if available
     if spec:
         try:
-            rel_path = path.relative_to(WORKSPACE)
+            rel_path = path.relative_to(get_workspace())
             return spec.match_file(str(rel_path))
         except ValueError:
             return False
@@ -2,10 +2,18 @@
 JSON File Tools - AutoGen Format
 """
 
+import asyncio
 import json
 import logging
 from typing import Any
 
+from app.agents.tools.common import resolve_workspace_path
+
+
+def _write_text(filepath: str, text: str, encoding: str) -> None:
+    with open(resolve_workspace_path(filepath), "w", encoding=encoding) as f:
+        f.write(text)
+
 
 async def read_json(filepath: str, encoding: str = "utf-8") -> dict[str, Any] | list[Any]:
     """
@@ -19,7 +27,7 @@ async def read_json(filepath: str, encoding: str = "utf-8") -> dict[str, Any] |
         Dict or List: Contents of the JSON file
     """
     try:
-        with open(filepath, encoding=encoding) as f:
+        with open(resolve_workspace_path(filepath), encoding=encoding) as f:
             data = json.load(f)
         return data
     except Exception as e:
@@ -49,8 +57,8 @@ async def write_json(
         str: Success or error message
     """
     try:
-        with open(filepath, "w", encoding=encoding) as f:
-            json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+        payload = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+        await asyncio.to_thread(_write_text, filepath, payload, encoding)
         return f"✓ JSON file saved successfully to {filepath}"
     except Exception as e:
         error_msg = f"Error writing JSON file {filepath}: {e!s}"
@@ -116,7 +124,7 @@ async def validate_json(filepath: str) -> str:
         str: Message indicating whether it's valid or not
     """
     try:
-        with open(filepath, encoding="utf-8") as f:
+        with open(resolve_workspace_path(filepath), encoding="utf-8") as f:
             json.load(f)
         return f"✓ {filepath} is a valid JSON"
     except json.JSONDecodeError as e:
@@ -1,6 +1,6 @@
 import os
 
-from app.agents.tools.common import EXCLUDED_DIRS
+from app.agents.tools.common import EXCLUDED_DIRS, get_workspace
 
 
 async def file_search(query: str, explanation: str = "") -> str:
@@ -17,12 +17,14 @@ async def file_search(query: str, explanation: str = "") -> str:
     try:
         matches = []
 
-        for root, dirs, files in os.walk("."):
+        workspace = str(get_workspace())
+
+        for root, dirs, files in os.walk(workspace):
             # Filter out ignored directories IN-PLACE to prevent os.walk from descending into them
             dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
 
             for file in files:
-                file_path = os.path.join(root, file)
+                file_path = os.path.relpath(os.path.join(root, file), workspace)
                 if query.lower() in file_path.lower():
                     matches.append(file_path)
                     if len(matches) >= 10:  # Cap at 10 results
@@ -2,10 +2,59 @@
 Tool for executing terminal commands safely
 """
 
+import asyncio
 import subprocess
 
 from app.agents.tools.common import get_workspace
 
+# Caps how many shell processes the agents can have running at once (shared by all chats)
+MAX_PARALLEL_COMMANDS = 4
+_command_slots = asyncio.Semaphore(MAX_PARALLEL_COMMANDS)
+
+
+async def _run_shell(command: str, cwd, timeout: float) -> tuple[int, str, str]:
+    """
+    Run a shell command without blocking the event loop. Returns (exit code, stdout, stderr).
+
+    The timeout also covers waiting for a free slot, so other chats' long commands can't stall this one indefinitely.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    await asyncio.wait_for(_command_slots.acquire(), timeout)
+    try:
+        return await _spawn_shell(command, cwd, max(deadline - loop.time(), 0.1))
+    finally:
+        _command_slots.release()
+
+
+async def _spawn_shell(command: str, cwd, timeout: float) -> tuple[int, str, str]:
+    try:
+        # shell=True is required for terminal command execution tool
+        proc = await asyncio.create_subprocess_shell(  # nosec B602
+            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd
+        )
+    except NotImplementedError:
+        # Windows SelectorEventLoop (e.g. uvicorn --reload) has no subprocess support
+        result = await asyncio.to_thread(
+            subprocess.run,  # nosec B602
+            command,
+            shell=True,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd,
+        )
+        return result.returncode, result.stdout, result.stderr
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+
+    return proc.returncode, stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+
 
 async def run_terminal_cmd(
     command: str,
@@ -116,23 +165,20 @@ The WebContainer handles all server processes automatically."""
         # Set timeout: 15 seconds for normal commands, 60 for build/check commands
         timeout_seconds = 60 if is_long_running else 15
 
-        # shell=True is required for terminal command execution tool
-        result = subprocess.run(  # nosec B602
-            command, shell=True, capture_output=True, text=True, timeout=timeout_seconds, cwd=workspace
-        )
+        returncode, stdout, stderr = await _run_shell(command, workspace, timeout_seconds)
 
         output = f"Command: {command}\n"
-        output += f"Exit code: {result.returncode}\n\n"
+        output += f"Exit code: {returncode}\n\n"
 
-        if result.stdout:
-            output += f"STDOUT:\n{result.stdout}\n"
+        if stdout:
+            output += f"STDOUT:\n{stdout}\n"
 
-        if result.stderr:
-            output += f"STDERR:\n{result.stderr}\n"
+        if stderr:
+            output += f"STDERR:\n{stderr}\n"
 
         return output
 
-    except subprocess.TimeoutExpired:
+    except (asyncio.TimeoutError, subprocess.TimeoutExpired):
         return f"""⏱️ COMMAND TIMEOUT ⏱️
 
 Command: {command}
@@ -1,3 +1,5 @@
+import asyncio
+import os
 from pathlib import Path
 
 from app.agents.tools.common import get_workspace
@@ -33,32 +35,52 @@ These files are for internal agent memory only and must not be written to the pr
 
         workspace = get_workspace()
         target = workspace / target_file if not Path(target_file).is_absolute() else Path(target_file)
-        # AUTOMATICALLY create all parent directories (like mkdir -p)
-        target.parent.mkdir(parents=True, exist_ok=True)
-        # Syntax Guardrail
-        lint_error = lint_code_check(target, file_content)
-        if lint_error:
-            return f"Error: The content you are trying to write has a syntax error.\n{lint_error}\nPlease fix the syntax before writing."
-
-        # --- SANITY CHECK: PREVENT OVERWRITE DEMOLITION ---
-        if target.exists():
-            try:
-                with open(target, encoding="utf-8") as f:
-                    old_content = f.read()
-                old_lines = len(old_content.splitlines())
-                new_lines = len(file_content.splitlines())
-
-                # Rule: If overwriting a large file (>1000 lines) with a small one (<100 lines)
-                # Updated for Gemini-3 Flash: can handle much larger files
-                if old_lines > 1000 and new_lines < 100:
-                    return f"Error: You are trying to overwrite a large file ({old_lines} lines) with very little content ({new_lines} lines). This looks like accidental data loss. If you meant to edit the file, use 'edit_file' instead. If you actually want to replace the file, delete it first using 'delete_file' and then write it."
-            except Exception:
-                # If we can't read the file (e.g. binary), skip check
-                pass
-        # --------------------------------------------------
-
-        with open(target, "w", encoding="utf-8") as f:
-            f.write(file_content)
-        return f"Successfully wrote {len(file_content)} characters to {target}"
+        # Linting and disk I/O block, so keep them off the event loop
+        return await asyncio.to_thread(_write_target, target, file_content)
     except Exception as e:
         return f"Error writing file: {e!s}"
+
+
+def _write_target(target: Path, file_content: str) -> str:
+    """Validate and write the file, creating parent directories as needed (runs in a worker thread)"""
+    # Syntax Guardrail
+    lint_error = lint_code_check(target, file_content)
+    if lint_error:
+        return f"Error: The content you are trying to write has a syntax error.\n{lint_error}\nPlease fix the syntax before writing."
+
+    # --- SANITY CHECK: PREVENT OVERWRITE DEMOLITION ---
+    if target.exists():
+        try:
+            with open(target, encoding="utf-8") as f:
+                old_content = f.read()
+            old_lines = len(old_content.splitlines())
+            new_lines = len(file_content.splitlines())
+
+            # Rule: If overwriting a large file (>1000 lines) with a small one (<100 lines)
+            # Updated for Gemini-3 Flash: can handle much larger files
+            if old_lines > 1000 and new_lines < 100:
+                return f"Error: You are trying to overwrite a large file ({old_lines} lines) with very little content ({new_lines} lines). This looks like accidental data loss. If you meant to edit the file, use 'edit_file' instead. If you actually want to replace the file, delete it first using 'delete_file' and then write it."
+        except Exception:
+            # If we can't read the file (e.g. binary), skip check
+            pass
+    # --------------------------------------------------
+
+    data = file_content.encode("utf-8")
+    try:
+        _write_bytes(target, data)
+    except FileNotFoundError:
+        # AUTOMATICALLY create all parent directories (like mkdir -p), only when they are missing
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _write_bytes(target, data)
+    return f"Successfully wrote {len(file_content)} characters to {target}"
+
+
+def _write_bytes(target: Path, data: bytes) -> None:
+    """Write data with a single open/write/close, bypassing Python's buffered I/O layers"""
+    fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
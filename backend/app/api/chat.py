@@ -1,8 +1,10 @@
-import json
+import asyncio
+from time import monotonic
 from typing import List
 
+import orjson
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -18,6 +20,20 @@ from app.services import ChatService
 
 router = APIRouter()
 
+# SSE framing, pre-encoded so each event is a single bytes concatenation
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+SSE_KEEP_ALIVE = b": keep-alive\n\n"
+
+# Flush a coalesced SSE chunk once it grows past this size
+SSE_FLUSH_BYTES = 16 * 1024
+
+# Events buffered between the agent and the client; once full, a slow client slows the agent down
+SSE_QUEUE_SIZE = 256
+
+# Sentinel queued by the producer once the agent stream is exhausted
+_STREAM_END = object()
+
 
 @router.post("/{project_id}/stream")
 async def send_chat_message_stream(project_id: int, chat_request: ChatRequest, db: Session = Depends(get_db)):
@@ -31,34 +47,72 @@ async def send_chat_message_stream(project_id: int, chat_request: ChatRequest, d
     - Final response with code changes
     """
 
-    async def event_generator():
-        import asyncio
-        from datetime import datetime as dt
+    # Validate up front so a bad request gets a proper 400 instead of an error event
+    ChatService.validate_chat_request(chat_request)
 
-        last_heartbeat = dt.now()
+    async def event_generator():
+        # The agent stream is consumed by a producer task so that events emitted
+        # while the previous chunk is still being written to the socket pile up in
+        # the queue and go out together as a single chunk.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+
+        async def produce():
+            # Cancellation (client gone) is not an Exception, so it skips both puts below
+            try:
+                async for event in ChatService.process_chat_message_stream(db, project_id, chat_request):
+                    await queue.put(event)
+            except Exception as e:
+                # Send error event
+                await queue.put({"type": "error", "data": {"message": str(e)}})
+            await queue.put(_STREAM_END)
+
+        producer = asyncio.create_task(produce())
+        last_heartbeat = monotonic()
 
         try:
-            async for event in ChatService.process_chat_message_stream(db, project_id, chat_request):
+            finished = False
+            while not finished:
+                event = await queue.get()
+
+                # Coalesce everything already queued (up to SSE_FLUSH_BYTES) into one chunk
+                chunk = []
+                chunk_size = 0
+                while True:
+                    if event is _STREAM_END:
+                        finished = True
+                        break
+
+                    # Format as SSE event
+                    try:
+                        frame = SSE_PREFIX + orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS) + SSE_SUFFIX
+                    except Exception as e:
+                        # Send error event and end the stream, as if the agent had failed
+                        error = {"type": "error", "data": {"message": str(e)}}
+                        chunk.append(SSE_PREFIX + orjson.dumps(error) + SSE_SUFFIX)
+                        finished = True
+                        break
+                    chunk.append(frame)
+                    chunk_size += len(frame)
+
+                    if chunk_size >= SSE_FLUSH_BYTES or queue.empty():
+                        break
+                    event = queue.get_nowait()
+
                 # Send keep-alive comment if it's been more than 15 seconds since last event
-                now = dt.now()
-                if (now - last_heartbeat).total_seconds() > 15:
+                now = monotonic()
+                if now - last_heartbeat > 15:
                     # Send SSE comment to keep connection alive (starts with :)
-                    yield ": keep-alive\n\n"
+                    yield SSE_KEEP_ALIVE
                     last_heartbeat = now
 
-                # Format as SSE event
-                yield f"data: {json.dumps(event)}\n\n"
+                if chunk:
+                    yield b"".join(chunk)
 
-                # Update heartbeat time after sending event
-                last_heartbeat = dt.now()
-
-                # Small delay to prevent overwhelming the client
-                await asyncio.sleep(0.01)
-
-        except Exception as e:
-            # Send error event
-            error_event = {"type": "error", "data": {"message": str(e)}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+                # Update heartbeat time after sending events
+                last_heartbeat = monotonic()
+        finally:
+            # Stop the agent run if the client went away mid-stream
+            producer.cancel()
 
     return StreamingResponse(
         event_generator(),
@@ -103,11 +157,10 @@ def get_chat_session(project_id: int, session_id: int, db: Session = Depends(get
     """Get a specific chat session with all messages"""
     from app.schemas.chat import ChatMessage as ChatMessageSchema
 
-    session = ChatService.get_session(db, session_id, project_id)
-    db_messages = ChatService.get_messages(db, session_id)
+    session = ChatService.get_session_with_messages(db, session_id, project_id)
 
     # Parse agent_interactions from message_metadata for each message
-    messages = [ChatMessageSchema.from_db_message(msg) for msg in db_messages]
+    messages = [ChatMessageSchema.from_db_message(msg) for msg in session.messages]
 
     return {
         "id": session.id,
@@ -128,7 +181,7 @@ def get_session_messages(project_id: int, session_id: int, limit: int = 100, db:
 
 
 @router.get("/{project_id}/sessions/{session_id}/reconnect")
-async def reconnect_to_session(
+def reconnect_to_session(
     project_id: int, session_id: int, since_message_id: int = 0, db: Session = Depends(get_db)
 ):
     """
@@ -144,22 +197,21 @@ async def reconnect_to_session(
     # Verify session belongs to project
     session = ChatService.get_session(db, session_id, project_id)
 
-    # Get all messages after the specified message_id
-    all_messages = ChatService.get_messages(db, session_id, limit=1000)
-
-    # Filter messages that come after since_message_id
-    new_messages = [msg for msg in all_messages if msg.id > since_message_id]
+    # Get messages after the specified message_id (filtered by the database)
+    new_messages = ChatService.get_messages(db, session_id, limit=1000, since_id=since_message_id)
 
-    # Parse agent_interactions from message_metadata
-    messages = [ChatMessageSchema.from_db_message(msg) for msg in new_messages]
+    # Serialize straight from the DB rows (no per-message model validation)
+    messages = [ChatMessageSchema.from_db_message_dict(msg) for msg in new_messages]
 
-    return {
-        "session_id": session_id,
-        "project_id": project_id,
-        "new_messages": messages,
-        "total_messages": len(all_messages),
-        "has_more": len(new_messages) > 0,
-    }
+    return ORJSONResponse(
+        {
+            "session_id": session_id,
+            "project_id": project_id,
+            "new_messages": messages,
+            "total_messages": ChatService.count_messages(db, session_id),
+            "has_more": len(new_messages) > 0,
+        }
+    )
 
 
 @router.delete("/{project_id}/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
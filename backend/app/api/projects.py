@@ -1,3 +1,4 @@
+import asyncio
 import io
 import json
 import zipfile
@@ -117,7 +118,8 @@ Remember to return ONLY the JSON object, nothing else."""
     # Create the project
     project_data = ProjectCreate(name=project_name, description=project_description)
 
-    project = ProjectService.create_project(db, project_data, MOCK_USER_ID)
+    # Project creation writes the scaffold and runs git init; keep it off the event loop
+    project = await asyncio.to_thread(ProjectService.create_project, db, project_data, MOCK_USER_ID)
 
     # Pass attachments through to response (for editor to use)
     return ProjectFromMessageResponse(
@@ -215,7 +217,7 @@ def add_file_to_project(project_id: int, file_data: ProjectFileCreate, db: Sessi
 
     # Return file info (matching database schema for compatibility)
     return {
-        "id": hash(file_data.filepath) % 100000,  # Generate pseudo-ID from filepath
+        "id": FileSystemService.file_id(file_data.filepath),  # Generate pseudo-ID from filepath
         "project_id": project_id,
         "filename": Path(file_data.filepath).name,
         "filepath": file_data.filepath,
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    BCRYPT_ROUNDS: int = 12  # Cost factor (2^rounds iterations); ~100ms per hash on typical hardware
 
     # CORS
     BACKEND_CORS_ORIGINS: list = [
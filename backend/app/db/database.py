@@ -1,17 +1,29 @@
+import logging
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, func, inspect, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./davelovable.db")
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {},
-)
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    # SQLite allows a single writer and its in-memory pool rejects sizing arguments, so keep the default pool
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    # Streaming chat endpoints keep requests open for minutes, so the pool is sized well
+    # above the 5 + 10 default and stale connections are detected before use
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=20,
+        max_overflow=40,
+        pool_pre_ping=True,
+        pool_recycle=300,
+    )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -29,6 +41,39 @@ def get_db():
         db.close()
 
 
+def _dedupe_project_files():
+    """
+    Older versions inserted a new project_files row on every save of the same path.
+    Keep only the newest row per (project_id, filepath) so the unique index can be built.
+    """
+    table = Base.metadata.tables["project_files"]
+    existing = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+    if "uq_project_filepath" in existing:
+        return
+
+    newest = select(func.max(table.c.id)).group_by(table.c.project_id, table.c.filepath)
+    with engine.begin() as conn:
+        removed = conn.execute(delete(table).where(table.c.id.not_in(newest))).rowcount
+    if removed:
+        logger.info(f"Removed {removed} duplicate project_files rows before adding uq_project_filepath")
+
+
 # Initialize database
 def init_db():
     Base.metadata.create_all(bind=engine)
+
+    if "project_files" in Base.metadata.tables:
+        try:
+            _dedupe_project_files()
+        except Exception as e:
+            logger.error(f"Could not remove duplicate project_files rows: {e}")
+
+    # create_all() skips tables that already exist, so make sure indexes added
+    # after a database was first created are present as well
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # A missing index only costs performance; don't keep the app from starting
+                logger.error(f"Could not create index {index.name} on {table.name}: {e}")
@@ -4,10 +4,12 @@ import io
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import api_router
 from app.core.config import settings
 from app.db import init_db
+from app.services.filesystem_service import FileSystemService
 
 # Set UTF-8 encoding for Windows console (for child processes)
 if sys.platform == 'win32':
@@ -21,9 +23,10 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)],
 )
 
-# Set specific loggers to DEBUG level for detailed agent output
-logging.getLogger("app.services.chat_service").setLevel(logging.DEBUG)
-logging.getLogger("app.agents").setLevel(logging.DEBUG)
+# Set specific loggers to DEBUG level for detailed agent output (development only)
+agent_log_level = logging.DEBUG if settings.DEBUG else logging.INFO
+logging.getLogger("app.services.chat_service").setLevel(agent_log_level)
+logging.getLogger("app.agents").setLevel(agent_log_level)
 logging.getLogger("autogen").setLevel(logging.INFO)
 logging.getLogger("uvicorn.error").setLevel(logging.INFO)  # Show our custom logs
 
@@ -33,6 +36,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
     redirect_slashes=False,  # Disable automatic trailing slash redirects
+    default_response_class=ORJSONResponse,  # Serialize response bodies with orjson
 )
 
 # Configure CORS
@@ -51,6 +55,9 @@ async def startup_event():
     """Initialize database on startup"""
     init_db()
 
+    # Finish removing project directories whose background delete was cut short by a restart
+    FileSystemService.cleanup_trash()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
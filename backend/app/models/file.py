@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -13,6 +13,8 @@ class ProjectFile(Base):
     """
 
     __tablename__ = "project_files"
+    # One metadata row per path within a project; also serves project/path lookups
+    __table_args__ = (Index("uq_project_filepath", "project_id", "filepath", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
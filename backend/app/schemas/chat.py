@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from pydantic import BaseModel, field_serializer
+import orjson
+from pydantic import BaseModel, ConfigDict, field_serializer
 
 from app.models.chat import MessageRole
 
@@ -22,8 +23,7 @@ class ChatMessageInDB(ChatMessageBase):
     session_id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
     @field_serializer('created_at')
     def serialize_created_at(self, dt: datetime, _info):
@@ -41,18 +41,7 @@ class ChatMessage(ChatMessageInDB):
     @classmethod
     def from_db_message(cls, db_message):
         """Convert database message to ChatMessage with parsed agent_interactions and attachments"""
-        import json
-
-        agent_interactions = None
-        attachments = None
-
-        if db_message.message_metadata:
-            try:
-                metadata = json.loads(db_message.message_metadata)
-                agent_interactions = metadata.get("agent_interactions", None)
-                attachments = metadata.get("attachments", None)
-            except:
-                pass
+        agent_interactions, attachments = _parse_message_metadata(db_message.message_metadata)
 
         return cls(
             id=db_message.id,
@@ -66,6 +55,43 @@ class ChatMessage(ChatMessageInDB):
             attachments=attachments,
         )
 
+    @staticmethod
+    def from_db_message_dict(db_message) -> dict:
+        """Same output as from_db_message(...).model_dump(mode="json"), built without model validation (trusted DB rows)"""
+        agent_interactions, attachments = _parse_message_metadata(db_message.message_metadata)
+
+        created_at = db_message.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+        return {
+            "id": db_message.id,
+            "session_id": db_message.session_id,
+            "role": db_message.role.value,
+            "content": db_message.content,
+            "agent_name": db_message.agent_name,
+            "message_metadata": db_message.message_metadata,
+            "created_at": created_at.isoformat(),
+            "agent_interactions": agent_interactions,
+            "attachments": attachments,
+        }
+
+
+def _parse_message_metadata(message_metadata: Optional[str]):
+    """Extract (agent_interactions, attachments) from a message_metadata JSON string"""
+    agent_interactions = None
+    attachments = None
+
+    if message_metadata:
+        try:
+            metadata = orjson.loads(message_metadata)
+            agent_interactions = metadata.get("agent_interactions", None)
+            attachments = metadata.get("attachments", None)
+        except (orjson.JSONDecodeError, AttributeError):
+            pass
+
+    return agent_interactions, attachments
+
 
 class ChatSessionBase(BaseModel):
     title: Optional[str] = "New Chat"
@@ -81,8 +107,7 @@ class ChatSessionInDB(ChatSessionBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
     @field_serializer('created_at', 'updated_at')
     def serialize_datetime(self, dt: datetime, _info):
@@ -116,6 +141,8 @@ class ChatRequest(BaseModel):
 
 
 class AgentInteraction(BaseModel):
+    model_config = ConfigDict(from_attributes=True)  # Built from ChatService's AgentInteractionRecord
+
     agent_name: str
     message_type: str  # "thought", "tool_call", "tool_response"
     content: str
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ProjectFileBase(BaseModel):
@@ -36,8 +36,7 @@ class ProjectFileInDB(ProjectFileBase):
     created_at: Optional[datetime] = None  # Optional for filesystem-only mode
     updated_at: Optional[datetime] = None  # Optional for filesystem-only mode
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectFile(ProjectFileInDB):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.models.project import ProjectStatus
 
@@ -38,8 +38,7 @@ class ProjectInDB(ProjectBase):
     updated_at: datetime
     thumbnail: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Project(ProjectInDB):
@@ -58,8 +57,7 @@ class ProjectSummary(BaseModel):
     template: str = "react-vite"
     framework: str = "react"
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectWithFiles(Project):
@@ -1,22 +1,64 @@
+import asyncio
+import base64
+from dataclasses import dataclass
 from io import BytesIO
+import json
 import logging
+import traceback
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+import orjson
+from autogen_agentchat.messages import MultiModalMessage
 from autogen_core import CancellationToken
+from autogen_core import Image as AGImage
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from PIL import Image
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
 from app.agents import get_orchestrator
+from app.agents.tools.common import reset_workspace, set_workspace
+from app.db.database import SessionLocal
 from app.models import ChatMessage, ChatSession, MessageRole, ProjectFile
 from app.schemas import ChatMessageCreate, ChatRequest, ChatSessionCreate
 from app.services.commit_message_service import CommitMessageService
 from app.services.filesystem_service import FileSystemService
 from app.services.git_service import GitService
+from app.utils.multimodal import process_attachment
 
 # Configure logging for agent interactions
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+# Characters of each file sent as a preview in the agent context
+CONTEXT_PREVIEW_CHARS = 500
+# Per-file read timeout when building the agent context; a stalled read yields an empty preview
+CONTEXT_READ_TIMEOUT = 2.0
+# Most recently updated files included in the agent context; the prompt still reports the true total
+MAX_CONTEXT_FILES = 50
+# Files to exclude from LLM context (internal use only)
+CONTEXT_EXCLUDED_FILES = {".agent_state.json", ".gitignore"}
+# Agent text messages containing any of these are control messages, not shown to the user
+SKIP_MESSAGE_PATTERNS = ("TASK_COMPLETED", "TERMINATE", "DELEGATE_TO_PLANNER", "SUBTASK_DONE")
+# Tools whose results mean project files changed on disk
+FILE_MOD_TOOLS = frozenset({"write_file", "replace_file_content", "edit_file", "multi_replace_file_content"})
+
+
+@dataclass(slots=True)
+class AgentInteractionRecord:
+    """
+    One agent event recorded during a chat turn.
+
+    Fixed-layout instead of a dict per event; orjson serializes it as-is for the SSE stream and
+    message_metadata, and the AgentInteraction schema validates it from attributes.
+    """
+
+    agent_name: str
+    message_type: str  # "thought", "tool_call", "tool_response"
+    content: Any
+    tool_name: Optional[str]
+    tool_arguments: Optional[dict]
+    timestamp: Union[datetime, str]
 
 
 class ChatService:
@@ -26,8 +68,7 @@ class ChatService:
     def create_session(db: Session, session_data: ChatSessionCreate) -> ChatSession:
         """Create a new chat session"""
 
-        db_session = ChatSession(**session_data.model_dump())
-        db.add(db_session)
+        db_session = ChatService._stage_session(db, session_data)
         db.commit()
         db.refresh(db_session)
         return db_session
@@ -45,6 +86,22 @@ class ChatService:
 
         return session
 
+    @staticmethod
+    def get_session_with_messages(db: Session, session_id: int, project_id: int) -> ChatSession:
+        """Get a chat session by ID with its messages eagerly loaded (one extra IN query, not N)"""
+
+        session = (
+            db.query(ChatSession)
+            .options(selectinload(ChatSession.messages))
+            .filter(ChatSession.id == session_id, ChatSession.project_id == project_id)
+            .first()
+        )
+
+        if not session:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat session not found")
+
+        return session
+
     @staticmethod
     def get_sessions(db: Session, project_id: int) -> List[ChatSession]:
         """Get all chat sessions for a project"""
@@ -60,24 +117,168 @@ class ChatService:
     def add_message(db: Session, message_data: ChatMessageCreate) -> ChatMessage:
         """Add a message to a chat session"""
 
-        db_message = ChatMessage(**message_data.model_dump())
-        db.add(db_message)
+        db_message = ChatService._stage_message(db, message_data)
         db.commit()
         db.refresh(db_message)
         return db_message
 
     @staticmethod
-    def get_messages(db: Session, session_id: int, limit: int = 100) -> List[ChatMessage]:
-        """Get messages for a session"""
+    def _stage_session(db: Session, session_data: ChatSessionCreate) -> ChatSession:
+        """Add a chat session and flush it for its id, leaving the commit to the caller"""
+
+        db_session = ChatSession(**session_data.model_dump())
+        db.add(db_session)
+        db.flush()
+        return db_session
+
+    @staticmethod
+    def _stage_message(db: Session, message_data: ChatMessageCreate) -> ChatMessage:
+        """Add a message and flush it for its id, leaving the commit to the caller"""
+
+        db_message = ChatMessage(**message_data.model_dump())
+        db.add(db_message)
+        db.flush()
+        return db_message
+
+    @staticmethod
+    def get_messages(db: Session, session_id: int, limit: int = 100, since_id: int = 0) -> List[ChatMessage]:
+        """Get messages for a session, optionally only those with an ID greater than since_id"""
 
         return (
             db.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at)
+            .filter(ChatMessage.session_id == session_id, ChatMessage.id > since_id)
+            .order_by(ChatMessage.id)
             .limit(limit)
             .all()
         )
 
+    @staticmethod
+    def count_messages(db: Session, session_id: int) -> int:
+        """Count messages in a session without loading them"""
+
+        return db.query(func.count(ChatMessage.id)).filter(ChatMessage.session_id == session_id).scalar()
+
+    @staticmethod
+    def validate_chat_request(chat_request: ChatRequest) -> None:
+        """Reject requests with nothing for the agents to work on, before any DB or filesystem work"""
+        if not chat_request.message.strip() and not chat_request.attachments:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message cannot be empty")
+
+    @staticmethod
+    def _interactions_metadata(agent_interactions: List[AgentInteractionRecord]) -> str:
+        """Serialize agent interactions into the message_metadata blob stored on the assistant message"""
+        # orjson handles the datetime timestamps of the non-streaming path natively
+        return orjson.dumps({"agent_interactions": agent_interactions}, default=str).decode()
+
+    @staticmethod
+    def _is_hidden_text_message(source: str, content: str) -> bool:
+        """Whether an agent text message is a user echo, a control message or too short to show"""
+        return (
+            source == "user"
+            or any(pattern in content for pattern in SKIP_MESSAGE_PATTERNS)
+            or len(content.strip()) < 10  # Skip very short messages
+        )
+
+    @staticmethod
+    def _parse_tool_arguments(arguments) -> Dict:
+        """Parse tool call arguments into a dict, falling back to {"raw": ...}"""
+        if isinstance(arguments, dict):
+            return arguments
+        if not isinstance(arguments, str):
+            return {"raw": str(arguments)}
+        try:
+            return orjson.loads(arguments)
+        except orjson.JSONDecodeError:
+            pass  # orjson is strict (no NaN/Infinity); let the stdlib parser have a go
+        try:
+            return json.loads(arguments)
+        except json.JSONDecodeError as e:
+            logger.warning(f"⚠️  Failed to parse tool arguments as JSON: {e}")
+            logger.warning(f"Arguments: {arguments[:200]}...")
+            # Store as raw but log the error for debugging
+            return {"raw": arguments}
+        except Exception as e:
+            logger.error(f"❌ Unexpected error parsing tool arguments: {e}")
+            return {"raw": arguments}
+
+    @staticmethod
+    def get_context_files(
+        db: Session, project_id: int, exclude: Iterable[str] = ()
+    ) -> Tuple[List[ProjectFile], int]:
+        """
+        Get the most recently updated project files for the agent context.
+
+        Returns at most MAX_CONTEXT_FILES files and the total number of matching files.
+        """
+
+        query = db.query(ProjectFile).filter(ProjectFile.project_id == project_id)
+        if exclude:
+            query = query.filter(ProjectFile.filename.notin_(exclude))
+
+        files = query.order_by(ProjectFile.updated_at.desc()).limit(MAX_CONTEXT_FILES).all()
+        if len(files) < MAX_CONTEXT_FILES:
+            return files, len(files)
+        return files, query.with_entities(func.count(ProjectFile.id)).scalar()
+
+    @staticmethod
+    async def read_context_files(project_id: int, filepaths: List[str], max_chars: Optional[int] = None) -> List[str]:
+        """
+        Read project files for the agent context concurrently in worker threads.
+
+        Returns contents in the same order as filepaths, truncated to max_chars if given.
+        Files that are missing, unreadable or time out come back as "".
+        """
+
+        def read(filepath: str) -> Optional[str]:
+            if max_chars is None:
+                return FileSystemService.read_file(project_id, filepath)
+            return FileSystemService.read_file_head(project_id, filepath, max_chars)
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(asyncio.to_thread(read, filepath), CONTEXT_READ_TIMEOUT) for filepath in filepaths),
+            return_exceptions=True,
+        )
+        return ["" if isinstance(result, BaseException) or result is None else result for result in results]
+
+    @staticmethod
+    def save_assistant_message(
+        message_id: Optional[int],
+        session_id: int,
+        message_metadata: str,
+        content: Optional[str] = None,
+        agent_name: Optional[str] = None,
+    ) -> Optional[ChatMessage]:
+        """
+        Create or update the streamed assistant message in its own short-lived session.
+
+        Blocking; the stream calls it through asyncio.to_thread so commits stay off the event loop.
+        Returns None if message_id no longer exists.
+        """
+        with SessionLocal() as write_db:
+            if not message_id:
+                return ChatService.add_message(
+                    write_db,
+                    ChatMessageCreate(
+                        session_id=session_id,
+                        role=MessageRole.ASSISTANT,
+                        content=content or "Processing...",
+                        agent_name=agent_name or "Team",
+                        message_metadata=message_metadata,
+                    ),
+                )
+
+            db_message = write_db.query(ChatMessage).filter(ChatMessage.id == message_id).first()
+            if not db_message:
+                return None
+
+            db_message.message_metadata = message_metadata
+            if content is not None:
+                db_message.content = content
+                db_message.agent_name = agent_name
+            write_db.commit()
+            write_db.refresh(db_message)
+            return db_message
+
     @staticmethod
     async def process_chat_message(db: Session, project_id: int, chat_request: ChatRequest) -> Dict:
         """
@@ -92,32 +293,38 @@ class ChatService:
             Dict with session_id, message, and code_changes
         """
 
-        # Get or create chat session
+        ChatService.validate_chat_request(chat_request)
+
+        # Get or create chat session (a new session is committed together with the user message)
         if chat_request.session_id:
             session = ChatService.get_session(db, chat_request.session_id, project_id)
         else:
-            session = ChatService.create_session(db, ChatSessionCreate(project_id=project_id))
+            session = ChatService._stage_session(db, ChatSessionCreate(project_id=project_id))
 
         # Save user message
-        user_message = ChatService.add_message(
+        ChatService._stage_message(
             db, ChatMessageCreate(session_id=session.id, role=MessageRole.USER, content=chat_request.message)
         )
+        db.commit()
 
         # Get project context (existing files from filesystem)
-        project_files = db.query(ProjectFile).filter(ProjectFile.project_id == project_id).all()
+        project_files, total_files = ChatService.get_context_files(db, project_id)
 
+        # First 500 chars of each file for context
+        contents = await ChatService.read_context_files(
+            project_id, [f.filepath for f in project_files], CONTEXT_PREVIEW_CHARS
+        )
         context = {
             "project_id": project_id,
+            "total_files": total_files,
             "files": [
                 {
                     "filename": f.filename,
                     "filepath": f.filepath,
                     "language": f.language,
-                    "content": (FileSystemService.read_file(project_id, f.filepath) or "")[
-                        :500
-                    ],  # First 500 chars for context
+                    "content": content,
                 }
-                for f in project_files
+                for f, content in zip(project_files, contents)
             ],
         }
 
@@ -136,18 +343,12 @@ class ChatService:
             }
 
         try:
-            # Set working directory to the project directory so agent tools work correctly
-            import os
-            from pathlib import Path
-
-            from app.core.config import settings
-
-            project_dir = Path(settings.PROJECTS_BASE_DIR) / f"project_{project_id}"
-            original_cwd = os.getcwd()
+            # Point agent tools at the project directory (per-context, so concurrent turns don't collide)
+            project_dir = FileSystemService.get_project_dir(project_id)
+            workspace_token = set_workspace(project_dir)
 
             try:
-                os.chdir(project_dir)
-                logger.info(f"📂 Changed working directory to: {project_dir}")
+                logger.info(f"📂 Agent workspace set to: {project_dir}")
 
                 # Build task description with context for the agents
                 task_description = f"""User Request: {chat_request.message}
@@ -155,120 +356,93 @@ class ChatService:
 Project Context:
 - Project ID: {project_id}
 - Working Directory: {project_dir}
-- Existing Files: {len(context["files"])} files
-- Files: {", ".join([f["filepath"] for f in context["files"]])}
+- Existing Files: {context["total_files"]} files
+- Files: {", ".join(f["filepath"] for f in context["files"])}
 
 IMPORTANT: You are working in the project directory. All file operations will be relative to this directory.
 Please analyze the request, create a plan if needed, and implement the solution."""
 
-                logger.info("=" * 80)
-                logger.info("🤖 STARTING MULTI-AGENT TEAM EXECUTION")
-                logger.info("=" * 80)
-                logger.info(f"📝 User Request: {chat_request.message}")
-                logger.info(f"📁 Project Files: {len(context['files'])}")
-                logger.info("=" * 80)
+                logger.info("🤖 STARTING MULTI-AGENT TEAM EXECUTION (project %s)", project_id)
+                logger.debug("📝 User Request: %s", chat_request.message)
+                logger.debug("📁 Project Files: %s", context["total_files"])
 
                 # List to collect agent interactions as events stream in
                 agent_interactions = []
 
+                # Fallback timestamp for events that don't carry their own
+                turn_started = datetime.now()
+
                 # Run the agent team using run_stream to capture events in real-time
                 async for message in orchestrator.main_team.run_stream(
                     task=task_description, cancellation_token=CancellationToken()
                 ):
                     # Get event type
                     event_type = type(message).__name__
-                    msg_source = message.source if hasattr(message, "source") else "Unknown"
-                    msg_timestamp = message.created_at if hasattr(message, "created_at") else datetime.now()
+                    msg_source = getattr(message, "source", "Unknown")
+                    msg_timestamp = getattr(message, "created_at", None) or turn_started
 
-                    logger.info(f"📨 Event: {event_type} from {msg_source}")
+                    logger.debug("📨 Event: %s from %s", event_type, msg_source)
 
                     # TextMessage - Agent thoughts/responses
                     if event_type == "TextMessage":
-                        content_preview = message.content[:200] if len(message.content) > 200 else message.content
-                        logger.info(f"💭 {msg_source}: {content_preview}")
+                        msg_content = message.content
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("💭 %s: %s", msg_source, msg_content[:200])
 
                         # Skip user messages and filter out system/control messages
-                        skip_patterns = ["TASK_COMPLETED", "TERMINATE", "DELEGATE_TO_PLANNER", "SUBTASK_DONE"]
-                        should_skip = (
-                            msg_source == "user"
-                            or any(pattern in message.content for pattern in skip_patterns)
-                            or len(message.content.strip()) < 10  # Skip very short messages
-                        )
-
-                        if not should_skip:
+                        if not ChatService._is_hidden_text_message(msg_source, msg_content):
                             agent_interactions.append(
-                                {
-                                    "agent_name": msg_source,
-                                    "message_type": "thought",
-                                    "content": message.content,
-                                    "tool_name": None,
-                                    "tool_arguments": None,
-                                    "timestamp": msg_timestamp,
-                                }
+                                AgentInteractionRecord(
+                                    agent_name=msg_source,
+                                    message_type="thought",
+                                    content=msg_content,
+                                    tool_name=None,
+                                    tool_arguments=None,
+                                    timestamp=msg_timestamp,
+                                )
                             )
 
                     # ToolCallRequestEvent - Tool calls
                     elif event_type == "ToolCallRequestEvent":
                         for tool_call in message.content:
-                            logger.info(f"🔧 Tool: {tool_call.name}")
-                            tool_args = {}
-                            try:
-                                import json
-
-                                if isinstance(tool_call.arguments, str):
-                                    tool_args = json.loads(tool_call.arguments)
-                                elif isinstance(tool_call.arguments, dict):
-                                    tool_args = tool_call.arguments
-                                else:
-                                    tool_args = {"raw": str(tool_call.arguments)}
-                            except json.JSONDecodeError as e:
-                                # Try to fix common JSON issues
-                                logger.warning(f"⚠️  Failed to parse tool arguments as JSON: {e}")
-                                logger.warning(f"Arguments: {tool_call.arguments[:200]}...")
-                                # Store as raw but log the error for debugging
-                                tool_args = {"raw": str(tool_call.arguments)}
-                            except Exception as e:
-                                logger.error(f"❌ Unexpected error parsing tool arguments: {e}")
-                                tool_args = {"raw": str(tool_call.arguments)}
+                            logger.debug("🔧 Tool: %s", tool_call.name)
+                            tool_args = ChatService._parse_tool_arguments(tool_call.arguments)
 
                             agent_interactions.append(
-                                {
-                                    "agent_name": msg_source,
-                                    "message_type": "tool_call",
-                                    "content": f"Calling: {tool_call.name}",
-                                    "tool_name": tool_call.name,
-                                    "tool_arguments": tool_args,
-                                    "timestamp": msg_timestamp,
-                                }
+                                AgentInteractionRecord(
+                                    agent_name=msg_source,
+                                    message_type="tool_call",
+                                    content=f"Calling: {tool_call.name}",
+                                    tool_name=tool_call.name,
+                                    tool_arguments=tool_args,
+                                    timestamp=msg_timestamp,
+                                )
                             )
 
                     # ToolCallExecutionEvent - Tool results
                     elif event_type == "ToolCallExecutionEvent":
                         for tool_result in message.content:
-                            result_preview = str(tool_result.content)[:200]
-                            logger.info(f"✅ Result ({tool_result.name}): {result_preview}")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("✅ Result (%s): %s", tool_result.name, str(tool_result.content)[:200])
 
                             agent_interactions.append(
-                                {
-                                    "agent_name": "System",
-                                    "message_type": "tool_response",
-                                    "content": tool_result.content,
-                                    "tool_name": tool_result.name,
-                                    "tool_arguments": None,
-                                    "timestamp": msg_timestamp,
-                                }
+                                AgentInteractionRecord(
+                                    agent_name="System",
+                                    message_type="tool_response",
+                                    content=tool_result.content,
+                                    tool_name=tool_result.name,
+                                    tool_arguments=None,
+                                    timestamp=msg_timestamp,
+                                )
                             )
 
                     # TaskResult - Final
                     elif event_type == "TaskResult":
                         result = message
-                        logger.info("=" * 80)
                         logger.info("✅ EXECUTION COMPLETED")
-                        logger.info("=" * 80)
             finally:
-                # Always restore original working directory
-                os.chdir(original_cwd)
-                logger.info(f"📂 Restored working directory to: {original_cwd}")
+                # Always restore the previous workspace
+                reset_workspace(workspace_token)
 
             # Extract the final response from the result
             response_content = ""
@@ -281,11 +455,8 @@ Please analyze the request, create a plan if needed, and implement the solution.
                 response_content = last_message.content if hasattr(last_message, "content") else str(last_message)
                 agent_name = last_message.source if hasattr(last_message, "source") else "Team"
 
-                logger.info("=" * 80)
-                logger.info(f"📤 FINAL RESPONSE (from {agent_name}):")
-                logger.info("=" * 80)
-                logger.info(response_content[:1000])
-                logger.info("=" * 80)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📤 FINAL RESPONSE (from %s):\n%s", agent_name, response_content[:1000])
             else:
                 response_content = "I processed your request successfully."
                 logger.warning("⚠️  No messages in result, using default response")
@@ -295,10 +466,15 @@ Please analyze the request, create a plan if needed, and implement the solution.
             # The agent uses write_file, edit_file tools directly
 
             # Save assistant message with the team's response
+            # All interactions go into the message's metadata blob, so the turn is still a single insert
             assistant_message = ChatService.add_message(
                 db,
                 ChatMessageCreate(
-                    session_id=session.id, role=MessageRole.ASSISTANT, content=response_content, agent_name=agent_name
+                    session_id=session.id,
+                    role=MessageRole.ASSISTANT,
+                    content=response_content,
+                    agent_name=agent_name,
+                    message_metadata=ChatService._interactions_metadata(agent_interactions),
                 ),
             )
 
@@ -318,8 +494,6 @@ Please analyze the request, create a plan if needed, and implement the solution.
             logger.error("=" * 80)
 
             # Log full traceback
-            import traceback
-
             logger.error("Full traceback:")
             logger.error(traceback.format_exc())
 
@@ -352,17 +526,16 @@ Please analyze the request, create a plan if needed, and implement the solution.
         - Final response (complete)
         """
 
-        # Get or create chat session
+        # Get or create chat session (a new session is committed together with the user message)
         if chat_request.session_id:
             session = ChatService.get_session(db, chat_request.session_id, project_id)
         else:
-            session = ChatService.create_session(db, ChatSessionCreate(project_id=project_id))
+            session = ChatService._stage_session(db, ChatSessionCreate(project_id=project_id))
+        is_new_session = not chat_request.session_id
 
         # Process attachments if present
         processed_attachments = []
         if chat_request.attachments:
-            from app.utils.multimodal import process_attachment
-
             for attachment in chat_request.attachments:
                 is_valid, error, processed_data, processed_mime = process_attachment(
                     attachment.type, attachment.mime_type, attachment.data, attachment.name
@@ -382,10 +555,9 @@ Please analyze the request, create a plan if needed, and implement the solution.
         # Save user message with attachments in metadata
         user_message_metadata = None
         if processed_attachments:
-            import json
             user_message_metadata = json.dumps({"attachments": processed_attachments})
 
-        user_message = ChatService.add_message(
+        user_message = ChatService._stage_message(
             db, ChatMessageCreate(
                 session_id=session.id,
                 role=MessageRole.USER,
@@ -393,37 +565,42 @@ Please analyze the request, create a plan if needed, and implement the solution.
                 message_metadata=user_message_metadata
             )
         )
+        # Read the ids before committing so they aren't reloaded from the expired instances
+        session_id, user_message_id = session.id, user_message.id
+        db.commit()
 
         # Yield initial event
-        yield {"type": "start", "data": {"session_id": session.id, "user_message_id": user_message.id}}
+        yield {"type": "start", "data": {"session_id": session_id, "user_message_id": user_message_id}}
 
-        # Get project context
-        project_files = db.query(ProjectFile).filter(ProjectFile.project_id == project_id).all()
+        # Get project context, leaving out internal files that should never be sent to the LLM
+        user_files, total_files = ChatService.get_context_files(db, project_id, exclude=CONTEXT_EXCLUDED_FILES)
 
         # Check if this is the first message in the session (optimize for speed)
-        message_count = db.query(ChatMessage).filter(ChatMessage.session_id == session.id).count()
-        is_first_message = message_count <= 1  # Only user message exists
-
-        # Files to exclude from LLM context (internal use only)
-        EXCLUDED_FILES = {".agent_state.json", ".gitignore"}
+        # A session created above only holds the user message, so there is nothing to count
+        is_first_message = is_new_session or ChatService.count_messages(db, session_id) <= 1
 
-        # Filter out internal files that should never be sent to the LLM
-        user_files = [f for f in project_files if f.filename not in EXCLUDED_FILES]
+        # Release the pooled connection before the long-running agent turn; the writes
+        # below use short-lived sessions so an open stream never pins a connection
+        db.close()
 
         # For first message: provide FULL file content to avoid wasteful read_file calls
         # For subsequent messages: provide only preview (first 500 chars)
+        contents = await ChatService.read_context_files(
+            project_id,
+            [f.filepath for f in user_files],
+            None if is_first_message else CONTEXT_PREVIEW_CHARS,
+        )
         context = {
             "project_id": project_id,
+            "total_files": total_files,
             "files": [
                 {
                     "filename": f.filename,
                     "filepath": f.filepath,
                     "language": f.language,
-                    "content": (FileSystemService.read_file(project_id, f.filepath) or "")
-                    if is_first_message
-                    else (FileSystemService.read_file(project_id, f.filepath) or "")[:500],
+                    "content": content,
                 }
-                for f in user_files  # Use filtered list instead of all project_files
+                for f, content in zip(user_files, contents)
             ],
         }
 
@@ -436,28 +613,17 @@ Please analyze the request, create a plan if needed, and implement the solution.
             return
 
         try:
-            import os
-            from pathlib import Path
-
-            from app.core.config import settings
-
-            project_dir = Path(settings.PROJECTS_BASE_DIR) / f"project_{project_id}"
-            original_cwd = os.getcwd()
+            project_dir = FileSystemService.get_project_dir(project_id)
+            workspace_token = set_workspace(project_dir)
 
             try:
-                os.chdir(project_dir)
-                logger.info(f"📂 Changed working directory to: {project_dir}")
+                logger.info(f"📂 Agent workspace set to: {project_dir}")
 
                 # Prepare multimodal content if attachments present
                 task_input = None  # Will be either string or MultiModalMessage
 
                 if processed_attachments:
                     # Build multimodal message using AutoGen format
-                    from autogen_agentchat.messages import MultiModalMessage
-                    from autogen_core import Image as AGImage
-                    from PIL import Image
-                    import base64
-
                     content_parts = []
 
                     # Add images to content
@@ -482,6 +648,20 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     # Build file tree
                     file_tree = "\n".join([f"  {f['filepath']}" for f in context["files"]])
 
+                    # Only promise the complete tree when every file actually made it into the context
+                    shown_files = len(context["files"])
+                    if shown_files < context["total_files"]:
+                        shown = f"showing {shown_files} of {context['total_files']} files, most recently updated first"
+                        file_tree_header = f"📂 FILE TREE ({shown}):"
+                        file_contents_header = f"📁 FILE CONTENT ({shown} - use read_file for files not listed here):"
+                        context_rules = """1. 📂 **Not every file is listed above** - use list_dir/read_file only for files missing from it
+2. 🚫 **NEVER use read_file on files shown above** - their full contents are provided"""
+                    else:
+                        file_tree_header = "📂 COMPLETE FILE TREE (provided in context - NEVER use list_dir):"
+                        file_contents_header = "📁 COMPLETE FILE STRUCTURE AND CONTENT (no need to use list_dir or read_file):"
+                        context_rules = """1. 🚫 **NEVER use list_dir** - The file tree is provided above in your context
+2. 🚫 **NEVER use read_file** - All file contents are provided above"""
+
                     task_description = f"""User Request: {chat_request.message}
 
 ⚡ FIRST MESSAGE OPTIMIZATION - ATOMIC EXECUTION STRATEGY:
@@ -493,12 +673,12 @@ Please analyze the request, create a plan if needed, and implement the solution.
 Project Context:
 - Project ID: {project_id}
 - Working Directory: {project_dir}
-- Existing Files: {len(context["files"])} files
+- Existing Files: {context["total_files"]} files
 
-📂 COMPLETE FILE TREE (provided in context - NEVER use list_dir):
+{file_tree_header}
 {file_tree}
 
-📁 COMPLETE FILE STRUCTURE AND CONTENT (no need to use list_dir or read_file):
+{file_contents_header}
 
 {file_contents_section}
 
@@ -511,8 +691,7 @@ Project Context:
 - Dev server runs automatically in WebContainer - NEVER run npm run dev or npm start
 
 ⚡ CRITICAL OPTIMIZATION RULES:
-1. 🚫 **NEVER use list_dir** - The file tree is provided above in your context
-2. 🚫 **NEVER use read_file** - All file contents are provided above
+{context_rules}
 3. 🚫 **NEVER use mkdir** - write_file automatically creates parent directories
 4. ⚡ **USE PARALLEL TOOL CALLING**: Call write_file up to 5 times in ONE response to create multiple files
 5. 🎭 **MOCK-FIRST**: If task needs external API/backend, create mock service with fake data first
@@ -528,8 +707,8 @@ Please implement the solution QUICKLY and EFFICIENTLY using parallel write_file
 Project Context:
 - Project ID: {project_id}
 - Working Directory: {project_dir}
-- Existing Files: {len(context["files"])} files
-- Files: {", ".join([f["filepath"] for f in context["files"]])}
+- Existing Files: {context["total_files"]} files
+- Files: {", ".join(f["filepath"] for f in context["files"])}
 
 ⚡ OPTIMIZATION REMINDER:
 - **write_file AUTOMATICALLY creates parent directories** - NEVER use mkdir
@@ -539,8 +718,6 @@ Please analyze the request, create a plan if needed, and implement the solution.
 
                 # Create multimodal message if attachments are present
                 if processed_attachments:
-                    from autogen_agentchat.messages import MultiModalMessage
-
                     # Prepend text description
                     content_parts.insert(0, task_description)
 
@@ -550,9 +727,7 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     # Use simple text task
                     task_input = task_description
 
-                logger.info("=" * 80)
-                logger.info("🤖 STARTING MULTI-AGENT TEAM EXECUTION (STREAMING)")
-                logger.info("=" * 80)
+                logger.info("🤖 STARTING MULTI-AGENT TEAM EXECUTION (STREAMING, project %s)", project_id)
 
                 # Note: Agent state is automatically loaded in get_orchestrator(project_id)
 
@@ -572,67 +747,55 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     nonlocal assistant_message_id
                     try:
                         # Update or create assistant message with current interactions
-                        if assistant_message_id:
-                            # Update existing message
-                            db_message = db.query(ChatMessage).filter(ChatMessage.id == assistant_message_id).first()
-                            if db_message:
-                                db_message.message_metadata = json.dumps({"agent_interactions": agent_interactions})
-                                db.commit()
-                                logger.info(
-                                    f"💾 Updated message {assistant_message_id} with {len(agent_interactions)} interactions"
-                                )
-                        else:
-                            # Create initial assistant message
-                            new_message = ChatService.add_message(
-                                db,
-                                ChatMessageCreate(
-                                    session_id=session.id,
-                                    role=MessageRole.ASSISTANT,
-                                    content="Processing...",
-                                    agent_name="Team",
-                                    message_metadata=json.dumps({"agent_interactions": agent_interactions}),
-                                ),
+                        db_message = await asyncio.to_thread(
+                            ChatService.save_assistant_message,
+                            assistant_message_id,
+                            session_id,
+                            ChatService._interactions_metadata(agent_interactions),
+                        )
+                        if db_message and assistant_message_id:
+                            logger.debug(
+                                "💾 Updated message %s with %d interactions", assistant_message_id, len(agent_interactions)
                             )
-                            assistant_message_id = new_message.id
-                            logger.info(f"💾 Created assistant message {assistant_message_id}")
+                        elif db_message:
+                            assistant_message_id = db_message.id
+                            logger.debug("💾 Created assistant message %s", assistant_message_id)
 
                         # Save agent state
                         await orchestrator.save_state(project_id)
-                        logger.info(f"💾 Saved agent state for project {project_id}")
+                        logger.debug("💾 Saved agent state for project %s", project_id)
                     except Exception as e:
                         logger.error(f"❌ Error saving incremental state: {e}")
 
+                # Fallback timestamp for events that don't carry their own
+                turn_started = datetime.now()
+
                 # Stream agent events in real-time
                 async for message in orchestrator.main_team.run_stream(
                     task=task_input, cancellation_token=CancellationToken()
                 ):
                     event_type = type(message).__name__
-                    msg_source = message.source if hasattr(message, "source") else "Unknown"
-                    msg_timestamp = message.created_at if hasattr(message, "created_at") else datetime.now()
+                    msg_source = getattr(message, "source", "Unknown")
+                    msg_timestamp = getattr(message, "created_at", None) or turn_started
+                    # Formatted once per event and shared by all of its interactions
+                    msg_timestamp = (
+                        msg_timestamp.isoformat() if hasattr(msg_timestamp, "isoformat") else str(msg_timestamp)
+                    )
 
-                    logger.info(f"📨 Event: {event_type} from {msg_source}")
+                    logger.debug("📨 Event: %s from %s", event_type, msg_source)
 
                     # TextMessage - Agent thoughts/responses
                     if event_type == "TextMessage":
                         # Skip user messages and filter out system/control messages
-                        skip_patterns = ["TASK_COMPLETED", "TERMINATE", "DELEGATE_TO_PLANNER", "SUBTASK_DONE"]
-                        should_skip = (
-                            msg_source == "user"
-                            or any(pattern in message.content for pattern in skip_patterns)
-                            or len(message.content.strip()) < 10  # Skip very short messages
-                        )
-
-                        if not should_skip:
-                            interaction_data = {
-                                "agent_name": msg_source,
-                                "message_type": "thought",
-                                "content": message.content,
-                                "tool_name": None,
-                                "tool_arguments": None,
-                                "timestamp": msg_timestamp.isoformat()
-                                if hasattr(msg_timestamp, "isoformat")
-                                else str(msg_timestamp),
-                            }
+                        if not ChatService._is_hidden_text_message(msg_source, message.content):
+                            interaction_data = AgentInteractionRecord(
+                                agent_name=msg_source,
+                                message_type="thought",
+                                content=message.content,
+                                tool_name=None,
+                                tool_arguments=None,
+                                timestamp=msg_timestamp,
+                            )
                             # Add to list for database storage
                             agent_interactions.append(interaction_data)
                             # Stream to frontend
@@ -644,36 +807,16 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     # ToolCallRequestEvent - Tool calls
                     elif event_type == "ToolCallRequestEvent":
                         for tool_call in message.content:
-                            tool_args = {}
-                            try:
-                                import json
-
-                                if isinstance(tool_call.arguments, str):
-                                    tool_args = json.loads(tool_call.arguments)
-                                elif isinstance(tool_call.arguments, dict):
-                                    tool_args = tool_call.arguments
-                                else:
-                                    tool_args = {"raw": str(tool_call.arguments)}
-                            except json.JSONDecodeError as e:
-                                # Try to fix common JSON issues
-                                logger.warning(f"⚠️  Failed to parse tool arguments as JSON: {e}")
-                                logger.warning(f"Arguments: {tool_call.arguments[:200]}...")
-                                # Store as raw but log the error for debugging
-                                tool_args = {"raw": str(tool_call.arguments)}
-                            except Exception as e:
-                                logger.error(f"❌ Unexpected error parsing tool arguments: {e}")
-                                tool_args = {"raw": str(tool_call.arguments)}
-
-                            interaction_data = {
-                                "agent_name": msg_source,
-                                "message_type": "tool_call",
-                                "content": f"Calling: {tool_call.name}",
-                                "tool_name": tool_call.name,
-                                "tool_arguments": tool_args,
-                                "timestamp": msg_timestamp.isoformat()
-                                if hasattr(msg_timestamp, "isoformat")
-                                else str(msg_timestamp),
-                            }
+                            tool_args = ChatService._parse_tool_arguments(tool_call.arguments)
+
+                            interaction_data = AgentInteractionRecord(
+                                agent_name=msg_source,
+                                message_type="tool_call",
+                                content=f"Calling: {tool_call.name}",
+                                tool_name=tool_call.name,
+                                tool_arguments=tool_args,
+                                timestamp=msg_timestamp,
+                            )
                             # Add to list for database storage
                             agent_interactions.append(interaction_data)
                             # Stream to frontend
@@ -692,16 +835,14 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     # ToolCallExecutionEvent - Tool results
                     elif event_type == "ToolCallExecutionEvent":
                         for tool_result in message.content:
-                            interaction_data = {
-                                "agent_name": "System",
-                                "message_type": "tool_response",
-                                "content": str(tool_result.content),
-                                "tool_name": tool_result.name,
-                                "tool_arguments": None,
-                                "timestamp": msg_timestamp.isoformat()
-                                if hasattr(msg_timestamp, "isoformat")
-                                else str(msg_timestamp),
-                            }
+                            interaction_data = AgentInteractionRecord(
+                                agent_name="System",
+                                message_type="tool_response",
+                                content=str(tool_result.content),
+                                tool_name=tool_result.name,
+                                tool_arguments=None,
+                                timestamp=msg_timestamp,
+                            )
                             # Add to list for database storage
                             agent_interactions.append(interaction_data)
                             # Stream to frontend
@@ -710,22 +851,15 @@ Please analyze the request, create a plan if needed, and implement the solution.
                         await save_incremental_state()
 
                         # Check if tool was a file modification tool
-                        file_mod_tools = {
-                            "write_file",
-                            "replace_file_content", 
-                            "edit_file", 
-                            "multi_replace_file_content"
-                        }
-                        
                         tool_names = [r.name for r in message.content]
-                        if any(name in file_mod_tools for name in tool_names):
-                            logger.info(f"📁 [Files Update] Detected file modification tools: {tool_names}")
+                        if not FILE_MOD_TOOLS.isdisjoint(tool_names):
+                            logger.debug("📁 [Files Update] Detected file modification tools: %s", tool_names)
                             
                             # Extract file updates from tool arguments
                             updated_files = []
                             
                             for tool_result in message.content:
-                                if tool_result.name in file_mod_tools:
+                                if tool_result.name in FILE_MOD_TOOLS:
                                     # Try to find original call arguments
                                     call_id = tool_result.call_id
                                     if call_id and call_id in pending_tool_calls:
@@ -766,7 +900,7 @@ Please analyze the request, create a plan if needed, and implement the solution.
                             
                             if updated_files:
                                 data_payload["files"] = updated_files
-                                logger.info(f"🚀 [Files Push] Pushing {len(updated_files)} files directly to frontend")
+                                logger.debug("🚀 [Files Push] Pushing %d files directly to frontend", len(updated_files))
 
                             yield {
                                 "type": "files_ready",
@@ -776,13 +910,10 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     # TaskResult - Final
                     elif event_type == "TaskResult":
                         result = message
-                        logger.info("=" * 80)
                         logger.info("✅ EXECUTION COMPLETED")
-                        logger.info("=" * 80)
 
             finally:
-                os.chdir(original_cwd)
-                logger.info(f"📂 Restored working directory to: {original_cwd}")
+                reset_workspace(workspace_token)
 
             # Extract final response
             response_content = ""
@@ -796,31 +927,17 @@ Please analyze the request, create a plan if needed, and implement the solution.
                 response_content = "I processed your request successfully."
 
             # Update final assistant message with completion status
+            # (creates the message if it wasn't created incrementally)
+            assistant_message = await asyncio.to_thread(
+                ChatService.save_assistant_message,
+                assistant_message_id,
+                session_id,
+                ChatService._interactions_metadata(agent_interactions),
+                response_content,
+                agent_name,
+            )
             if assistant_message_id:
-                # Update existing message with final content
-                db_message = db.query(ChatMessage).filter(ChatMessage.id == assistant_message_id).first()
-                if db_message:
-                    db_message.content = response_content
-                    db_message.agent_name = agent_name
-                    db_message.message_metadata = json.dumps({"agent_interactions": agent_interactions})
-                    db.commit()
-                    db.refresh(db_message)
-                    assistant_message = db_message
-                    logger.info(f"✅ Updated final message {assistant_message_id}")
-            else:
-                # Create message if it wasn't created incrementally
-                import json
-
-                assistant_message = ChatService.add_message(
-                    db,
-                    ChatMessageCreate(
-                        session_id=session.id,
-                        role=MessageRole.ASSISTANT,
-                        content=response_content,
-                        agent_name=agent_name,
-                        message_metadata=json.dumps({"agent_interactions": agent_interactions}),
-                    ),
-                )
+                logger.info(f"✅ Updated final message {assistant_message_id}")
 
             # Final save of agent state
             logger.info("📦 [Save State] Saving agent state to filesystem...")
@@ -846,7 +963,8 @@ Please analyze the request, create a plan if needed, and implement the solution.
                 logger.info("🔄 Creating automatic Git commit...")
 
                 # Get the git diff to see what changed
-                diff_output = GitService.get_diff(project_id)
+                # (git runs as a subprocess, so keep it off the event loop)
+                diff_output = await asyncio.to_thread(GitService.get_diff, project_id)
 
                 if diff_output and diff_output.strip():
                     # Generate commit message using LLM
@@ -858,8 +976,9 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     full_commit_message = f"{commit_info['title']}\n\n{commit_info['body']}"
                     commit_message_title = commit_info['title']
 
-                    # Create the commit (synchronous git operation)
-                    commit_success = GitService.commit_changes(
+                    # Create the commit (synchronous git operation, run in a worker thread)
+                    commit_success = await asyncio.to_thread(
+                        GitService.commit_changes,
                         project_id=project_id,
                         message=full_commit_message,
                         files=None,  # Commit all changes
@@ -868,14 +987,12 @@ Please analyze the request, create a plan if needed, and implement the solution.
                     if commit_success:
                         logger.info(f"✅ Git commit created: {commit_info['title']}")
 
-                        # Get the latest commit hash
-                        commits = GitService.get_commit_history(project_id, limit=1)
-                        if commits:
-                            commit_hash = commits[0]['hash']
+                        # Get the latest commit hash and commit count from a single git log
+                        all_commits = await asyncio.to_thread(GitService.get_commit_history, project_id, 100)
+                        if all_commits:
+                            commit_hash = all_commits[0]['hash']
                             logger.info(f"📝 Commit hash: {commit_hash}")
 
-                        # Get commit count
-                        all_commits = GitService.get_commit_history(project_id, limit=100)
                         commit_count = len(all_commits)
                         logger.info(f"📊 Total commits in project: {commit_count}")
 
@@ -932,7 +1049,7 @@ Please analyze the request, create a plan if needed, and implement the solution.
             yield {
                 "type": "complete",
                 "data": {
-                    "session_id": session.id,
+                    "session_id": session_id,
                     "message": {
                         "id": assistant_message.id,
                         "session_id": assistant_message.session_id,
@@ -952,8 +1069,6 @@ Please analyze the request, create a plan if needed, and implement the solution.
             logger.error(f"Error: {e!s}")
             logger.error("=" * 80)
 
-            import traceback
-
             logger.error(traceback.format_exc())
 
             yield {"type": "error", "data": {"message": str(e)}}
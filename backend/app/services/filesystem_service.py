@@ -1,92 +1,68 @@
-import json
+import logging
 import os
 import shutil
 import stat
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from app.core.config import settings
-
-
-class FileSystemService:
-    """Service for managing physical project files on disk"""
-
-    @staticmethod
-    def _handle_remove_readonly(func, path, exc_info):
-        """
-        Error handler for Windows readonly file deletion.
-        Used with shutil.rmtree to handle permission errors.
-        """
-        # Check if it's a permission error
-        if not os.access(path, os.W_OK):
-            # Change the file to be writable and try again
-            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
-            func(path)
-        else:
-            raise
-
-    @staticmethod
-    def get_project_dir(project_id: int) -> Path:
-        """Get the directory path for a project"""
-        base_dir = Path(settings.PROJECTS_BASE_DIR)
-        project_dir = base_dir / f"project_{project_id}"
-        return project_dir
+import orjson
 
-    @staticmethod
-    def create_project_structure(project_id: int, project_name: str) -> Dict[str, str]:
-        """
-        Create physical project structure with initial files and initialize Git
-        Returns a dict of created files and their content
-        """
-        from app.services.git_service import GitService
-
-        project_dir = FileSystemService.get_project_dir(project_id)
+from app.core.config import settings
 
-        # Create project directory if it doesn't exist
-        project_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create basic project structure
-        src_dir = project_dir / "src"
-        src_dir.mkdir(exist_ok=True)
-
-        components_dir = src_dir / "components"
-        components_dir.mkdir(exist_ok=True)
-
-        # Create package.json
-        package_json = {
-            "name": project_name.lower().replace(" ", "-"),
-            "version": "0.1.0",
-            "private": True,
-            "type": "module",
-            "scripts": {"dev": "vite", "build": "tsc && vite build", "preview": "vite preview"},
-            "dependencies": {
-                "react": "^18.3.1",
-                "react-dom": "^18.3.1",
-                "lucide-react": "^0.263.1",
-                "date-fns": "^2.30.0",
-                "clsx": "^2.1.0",
-                "react-router-dom": "^6.26.0",
-                "axios": "^1.7.0",
-                "zustand": "^4.5.0",
-                "@tanstack/react-query": "^5.0.0",
-                "framer-motion": "^11.0.0",
-                "react-hook-form": "^7.51.0",
-                "zod": "^3.22.0",
-            },
-            "devDependencies": {
-                "@types/react": "^18.3.12",
-                "@types/react-dom": "^18.3.1",
-                "@vitejs/plugin-react": "^4.3.4",
-                "typescript": "^5.8.0",
-                "vite": "^5.4.11",
-                "tailwindcss": "^3.4.17",
-                "autoprefixer": "^10.4.20",
-                "postcss": "^8.4.49",
-            },
-        }
+logger = logging.getLogger(__name__)
+
+# Deleted project directories are renamed to "<prefix><dir name>_<uuid>" and removed in the background
+_TRASH_PREFIX = ".trash_"
+
+# Resolved project directories by project id (Path objects are immutable, so they can be shared)
+_project_dirs: Dict[int, Path] = {}
+
+# LRU of file heads keyed by (project_id, filepath, max_chars, mtime_ns, size): unchanged files cost
+# only a stat. Reads happen in worker threads, hence the lock.
+_PREVIEW_CACHE_SIZE = 1024
+_preview_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+_preview_lock = threading.Lock()
+
+# Project scaffold templates, built once at import. Only the project name varies per project.
+_PACKAGE_JSON_BASE = {
+    "version": "0.1.0",
+    "private": True,
+    "type": "module",
+    "scripts": {"dev": "vite", "build": "tsc && vite build", "preview": "vite preview"},
+    "dependencies": {
+        "react": "^18.3.1",
+        "react-dom": "^18.3.1",
+        "lucide-react": "^0.263.1",
+        "date-fns": "^2.30.0",
+        "clsx": "^2.1.0",
+        "react-router-dom": "^6.26.0",
+        "axios": "^1.7.0",
+        "zustand": "^4.5.0",
+        "@tanstack/react-query": "^5.0.0",
+        "framer-motion": "^11.0.0",
+        "react-hook-form": "^7.51.0",
+        "zod": "^3.22.0",
+    },
+    "devDependencies": {
+        "@types/react": "^18.3.12",
+        "@types/react-dom": "^18.3.1",
+        "@vitejs/plugin-react": "^4.3.4",
+        "typescript": "^5.8.0",
+        "vite": "^5.4.11",
+        "tailwindcss": "^3.4.17",
+        "autoprefixer": "^10.4.20",
+        "postcss": "^8.4.49",
+    },
+}
 
-        # Create vite.config.ts
-        vite_config = """import { defineConfig } from 'vite'
+_VITE_CONFIG = """import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
 export default defineConfig({
@@ -98,43 +74,46 @@ export default defineConfig({
 })
 """
 
-        # Create tsconfig.json
-        tsconfig = {
-            "compilerOptions": {
-                "target": "ES2020",
-                "useDefineForClassFields": True,
-                "lib": ["ES2020", "DOM", "DOM.Iterable"],
-                "module": "ESNext",
-                "skipLibCheck": True,
-                "moduleResolution": "bundler",
-                "allowImportingTsExtensions": True,
-                "resolveJsonModule": True,
-                "isolatedModules": True,
-                "noEmit": True,
-                "jsx": "react-jsx",
-                "strict": True,
-                "noUnusedLocals": True,
-                "noUnusedParameters": True,
-                "noFallthroughCasesInSwitch": True,
-            },
-            "include": ["src"],
-            "references": [{"path": "./tsconfig.node.json"}],
-        }
-
-        # Create tsconfig.node.json
-        tsconfig_node = {
-            "compilerOptions": {
-                "composite": True,
-                "skipLibCheck": True,
-                "module": "ESNext",
-                "moduleResolution": "bundler",
-                "allowSyntheticDefaultImports": True,
-            },
-            "include": ["vite.config.ts"],
-        }
-
-        # Create tailwind.config.js
-        tailwind_config = """/** @type {import('tailwindcss').Config} */
+_TSCONFIG_JSON = orjson.dumps(
+    {
+        "compilerOptions": {
+            "target": "ES2020",
+            "useDefineForClassFields": True,
+            "lib": ["ES2020", "DOM", "DOM.Iterable"],
+            "module": "ESNext",
+            "skipLibCheck": True,
+            "moduleResolution": "bundler",
+            "allowImportingTsExtensions": True,
+            "resolveJsonModule": True,
+            "isolatedModules": True,
+            "noEmit": True,
+            "jsx": "react-jsx",
+            "strict": True,
+            "noUnusedLocals": True,
+            "noUnusedParameters": True,
+            "noFallthroughCasesInSwitch": True,
+        },
+        "include": ["src"],
+        "references": [{"path": "./tsconfig.node.json"}],
+    },
+    option=orjson.OPT_INDENT_2,
+).decode()
+
+_TSCONFIG_NODE_JSON = orjson.dumps(
+    {
+        "compilerOptions": {
+            "composite": True,
+            "skipLibCheck": True,
+            "module": "ESNext",
+            "moduleResolution": "bundler",
+            "allowSyntheticDefaultImports": True,
+        },
+        "include": ["vite.config.ts"],
+    },
+    option=orjson.OPT_INDENT_2,
+).decode()
+
+_TAILWIND_CONFIG = """/** @type {import('tailwindcss').Config} */
 export default {
   content: [
     "./index.html",
@@ -147,8 +126,7 @@ export default {
 }
 """
 
-        # Create postcss.config.js
-        postcss_config = """export default {
+_POSTCSS_CONFIG = """export default {
   plugins: {
     tailwindcss: {},
     autoprefixer: {},
@@ -156,35 +134,7 @@ export default {
 }
 """
 
-        # Read console logger script template
-        console_logger_path = Path(__file__).parent.parent / "templates" / "console_logger.js"
-        try:
-            with open(console_logger_path, encoding="utf-8") as f:
-                console_logger_script = f.read()
-        except FileNotFoundError:
-            console_logger_script = "// Console logger not found"
-
-        # Create index.html with injected console logger
-        index_html = f"""<!DOCTYPE html>
-<html lang="en">
-  <head>
-    <meta charset="UTF-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-    <title>{project_name}</title>
-  </head>
-  <body>
-    <div id="root"></div>
-    <!-- Browser Console Logger for AI Agent -->
-    <script>
-{console_logger_script}
-    </script>
-    <script type="module" src="/src/main.tsx"></script>
-  </body>
-</html>
-"""
-
-        # Create src/main.tsx
-        main_tsx = """import React from 'react'
+_MAIN_TSX = """import React from 'react'
 import ReactDOM from 'react-dom/client'
 import App from './App'
 import './index.css'
@@ -196,9 +146,7 @@ ReactDOM.createRoot(document.getElementById('root')!).render(
 )
 """
 
-        # Create src/App.tsx
-        app_tsx = (
-            """import React from 'react'
+_APP_TSX_HEAD = """import React from 'react'
 
 function App() {
   return (
@@ -206,8 +154,8 @@ function App() {
       <div className="text-center">
         <h1 className="text-4xl font-bold text-gray-900 mb-4">
           Welcome to """
-            + project_name
-            + """
+
+_APP_TSX_TAIL = """
         </h1>
         <p className="text-lg text-gray-600">
           Start building your amazing application!
@@ -219,10 +167,8 @@ function App() {
 
 export default App
 """
-        )
 
-        # Create src/index.css
-        index_css = """@tailwind base;
+_INDEX_CSS = """@tailwind base;
 @tailwind components;
 @tailwind utilities;
 
@@ -241,38 +187,220 @@ code {
 }
 """
 
-        # Write all files
-        files_created = {}
+_CONSOLE_LOGGER_PATH = Path(__file__).parent.parent / "templates" / "console_logger.js"
+
+# Shared pool for writing the scaffold files of a new project in parallel
+_scaffold_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="scaffold")
+
+
+@lru_cache(maxsize=None)
+def _console_logger_script() -> str:
+    """Browser console logger injected into every index.html (read once)"""
+    try:
+        with open(_CONSOLE_LOGGER_PATH, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return "// Console logger not found"
+
+
+# Directories never listed when collecting project files (dependencies, VCS, build artifacts, caches)
+_EXCLUDED_DIRS = frozenset(
+    {
+        "node_modules",
+        ".git",
+        "dist",
+        "build",
+        ".vite",
+        "coverage",
+        ".turbo",
+        ".next",
+        ".cache",
+        "__pycache__",
+        ".pytest_cache",
+        ".mypy_cache",
+    }
+)
+
+# Files left out of the project bundle
+_EXCLUDED_FILES = frozenset(
+    {
+        ".DS_Store",
+        "Thumbs.db",
+        ".env",
+        ".env.local",
+        "package-lock.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+    }
+)
+
+# The editor file list additionally hides internal/config files
+_EXCLUDED_EDITOR_FILES = _EXCLUDED_FILES | {".gitignore", ".browser_logs.json", ".agent_state.json"}
+
+# Binary assets that never decode as UTF-8; skipped by name before any read is attempted
+_BINARY_EXTENSIONS = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".bmp", ".avif",
+        ".woff", ".woff2", ".ttf", ".otf", ".eot",
+        ".mp3", ".mp4", ".wav", ".ogg", ".webm", ".mov",
+        ".zip", ".gz", ".tgz", ".tar", ".7z", ".rar",
+        ".pdf", ".wasm", ".exe", ".dll", ".so", ".dylib", ".pyc", ".db", ".sqlite",
+    }
+)
+
+# Language mapping by extension
+_LANGUAGE_MAP = {
+    ".tsx": "tsx",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".js": "javascript",
+    ".css": "css",
+    ".html": "html",
+    ".json": "json",
+    ".md": "markdown",
+    ".py": "python",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+}
+
+# LRU of the last listing of recently listed projects: relative path -> (mtime_ns, size, ctime_ns, content).
+# Each call stores a fresh snapshot, so files only get re-read when their stat changes
+_LISTING_CACHE_SIZE = 8
+_listing_cache: "OrderedDict[int, Dict[str, Tuple[int, int, int, Optional[str]]]]" = OrderedDict()
+_listing_lock = threading.Lock()
+
+# Shared pool for reading project files in parallel so per-file I/O latency overlaps
+_read_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="project-read")
+
+
+def _walk_files(root: Path, excluded_dirs) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    Yield (entry, relative posix path) for every file under root.
+
+    Uses os.scandir so file/dir checks come from the directory listing instead of a stat per
+    entry, and never descends into excluded_dirs (or symlinked directories, like rglob).
+    """
+    stack = [(str(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            stack.append((entry.path, f"{rel_dir}{entry.name}/"))
+                    elif entry.is_file():
+                        yield entry, f"{rel_dir}{entry.name}"
+        except OSError:
+            continue
+
+
+def _iter_project_files(project_dir: Path, excluded_files) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield (entry, relative path) for project files worth reading, skipping excluded names and binary assets"""
+    for entry, relative_path in _walk_files(project_dir, _EXCLUDED_DIRS):
+        if entry.name in excluded_files or os.path.splitext(entry.name)[1].lower() in _BINARY_EXTENSIONS:
+            continue
+        yield entry, relative_path
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a UTF-8 text file, or None if it is binary or can't be read"""
+    try:
+        # Raw read + one decode skips the per-file TextIOWrapper
+        with open(path, "rb") as f:
+            content = f.read().decode("utf-8")
+    except Exception:
+        return None
+    # Same newline normalisation text mode would do
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
 
-        (project_dir / "package.json").write_text(json.dumps(package_json, indent=2))
-        files_created["package.json"] = json.dumps(package_json, indent=2)
+class FileSystemService:
+    """Service for managing physical project files on disk"""
 
-        (project_dir / "vite.config.ts").write_text(vite_config)
-        files_created["vite.config.ts"] = vite_config
+    @staticmethod
+    def _handle_remove_readonly(func, path, exc_info):
+        """
+        Error handler for Windows readonly file deletion.
+        Used with shutil.rmtree to handle permission errors.
+        """
+        # Check if it's a permission error
+        if not os.access(path, os.W_OK):
+            # Change the file to be writable and try again
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            func(path)
+        else:
+            raise
 
-        (project_dir / "tsconfig.json").write_text(json.dumps(tsconfig, indent=2))
-        files_created["tsconfig.json"] = json.dumps(tsconfig, indent=2)
+    @staticmethod
+    def get_project_dir(project_id: int) -> Path:
+        """Get the directory path for a project"""
+        project_dir = _project_dirs.get(project_id)
+        if project_dir is None:
+            project_dir = Path(settings.PROJECTS_BASE_DIR) / f"project_{project_id}"
+            _project_dirs[project_id] = project_dir
+        return project_dir
 
-        (project_dir / "tsconfig.node.json").write_text(json.dumps(tsconfig_node, indent=2))
-        files_created["tsconfig.node.json"] = json.dumps(tsconfig_node, indent=2)
+    @staticmethod
+    def create_project_structure(project_id: int, project_name: str) -> Dict[str, str]:
+        """
+        Create physical project structure with initial files and initialize Git
+        Returns a dict of created files and their content
+        """
+        from app.services.git_service import GitService
 
-        (project_dir / "tailwind.config.js").write_text(tailwind_config)
-        files_created["tailwind.config.js"] = tailwind_config
+        project_dir = FileSystemService.get_project_dir(project_id)
 
-        (project_dir / "postcss.config.js").write_text(postcss_config)
-        files_created["postcss.config.js"] = postcss_config
+        # Create project directory and basic structure (project/src/components) in one call
+        (project_dir / "src" / "components").mkdir(parents=True, exist_ok=True)
 
-        (project_dir / "index.html").write_text(index_html)
-        files_created["index.html"] = index_html
+        # Read console logger script template
+        console_logger_script = _console_logger_script()
 
-        (src_dir / "main.tsx").write_text(main_tsx)
-        files_created["src/main.tsx"] = main_tsx
+        # Create index.html with injected console logger
+        index_html = f"""<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+    <title>{project_name}</title>
+  </head>
+  <body>
+    <div id="root"></div>
+    <!-- Browser Console Logger for AI Agent -->
+    <script>
+{console_logger_script}
+    </script>
+    <script type="module" src="/src/main.tsx"></script>
+  </body>
+</html>
+"""
 
-        (src_dir / "App.tsx").write_text(app_tsx)
-        files_created["src/App.tsx"] = app_tsx
+        # package.json and src/App.tsx carry the project name
+        package_json = {"name": project_name.lower().replace(" ", "-"), **_PACKAGE_JSON_BASE}
+        app_tsx = _APP_TSX_HEAD + project_name + _APP_TSX_TAIL
+
+        files_created = {
+            "package.json": orjson.dumps(package_json, option=orjson.OPT_INDENT_2).decode(),
+            "vite.config.ts": _VITE_CONFIG,
+            "tsconfig.json": _TSCONFIG_JSON,
+            "tsconfig.node.json": _TSCONFIG_NODE_JSON,
+            "tailwind.config.js": _TAILWIND_CONFIG,
+            "postcss.config.js": _POSTCSS_CONFIG,
+            "index.html": index_html,
+            "src/main.tsx": _MAIN_TSX,
+            "src/App.tsx": app_tsx,
+            "src/index.css": _INDEX_CSS,
+        }
 
-        (src_dir / "index.css").write_text(index_css)
-        files_created["src/index.css"] = index_css
+        # Write all files concurrently; they are small and independent, so each write is latency-bound
+        list(
+            _scaffold_pool.map(
+                lambda item: (project_dir / item[0]).write_bytes(item[1].encode("utf-8")), files_created.items()
+            )
+        )
 
         # Initialize Git repository
         GitService.init_repository(project_id)
@@ -285,11 +413,13 @@ code {
         project_dir = FileSystemService.get_project_dir(project_id)
         file_path = project_dir / filepath
 
-        # Create parent directories if they don't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write file
-        file_path.write_text(content, encoding="utf-8")
+        # Write file, creating parent directories only when they turn out to be missing
+        data = content.encode("utf-8")
+        try:
+            file_path.write_bytes(data)
+        except FileNotFoundError:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(data)
 
     @staticmethod
     def read_file(project_id: int, filepath: str) -> Optional[str]:
@@ -297,10 +427,44 @@ code {
         project_dir = FileSystemService.get_project_dir(project_id)
         file_path = project_dir / filepath
 
-        if not file_path.exists():
+        try:
+            return file_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def read_file_head(project_id: int, filepath: str, max_chars: int) -> Optional[str]:
+        """Read only the first max_chars characters of a file from the project directory (cached by mtime)"""
+        file_path = FileSystemService.get_project_dir(project_id) / filepath
+
+        try:
+            st = os.stat(file_path)
+            key = (project_id, filepath, max_chars, st.st_mtime_ns, st.st_size)
+            with _preview_lock:
+                if key in _preview_cache:
+                    _preview_cache.move_to_end(key)
+                    return _preview_cache[key]
+
+            with open(file_path, encoding="utf-8") as f:
+                head = f.read(max_chars)
+        except FileNotFoundError:
             return None
 
-        return file_path.read_text(encoding="utf-8")
+        with _preview_lock:
+            _preview_cache[key] = head
+            if len(_preview_cache) > _PREVIEW_CACHE_SIZE:
+                _preview_cache.popitem(last=False)
+        return head
+
+    @staticmethod
+    def clear_preview_cache(project_id: Optional[int] = None) -> None:
+        """Drop cached file heads, for one project or for all of them"""
+        with _preview_lock:
+            if project_id is None:
+                _preview_cache.clear()
+                return
+            for key in [key for key in _preview_cache if key[0] == project_id]:
+                del _preview_cache[key]
 
     @staticmethod
     def delete_file(project_id: int, filepath: str) -> bool:
@@ -308,24 +472,73 @@ code {
         project_dir = FileSystemService.get_project_dir(project_id)
         file_path = project_dir / filepath
 
-        if not file_path.exists():
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
             return False
-
-        file_path.unlink()
         return True
 
     @staticmethod
     def delete_project(project_id: int) -> bool:
         """Delete entire project directory"""
         project_dir = FileSystemService.get_project_dir(project_id)
+        _project_dirs.pop(project_id, None)
+        with _listing_lock:
+            _listing_cache.pop(project_id, None)
+        FileSystemService.clear_preview_cache(project_id)
 
         if not project_dir.exists():
             return False
 
+        # Move the directory out of the way (one rename) and remove it in the background, so the
+        # request doesn't wait on unlinking a whole node_modules tree
+        trash_dir = project_dir.with_name(f"{_TRASH_PREFIX}{project_dir.name}_{uuid.uuid4().hex}")
+        try:
+            os.rename(project_dir, trash_dir)
+        except OSError:
+            # e.g. files locked on Windows: fall back to removing in place
+            pass
+        else:
+            threading.Thread(
+                target=FileSystemService._remove_trash_dirs,
+                args=([trash_dir],),
+                name=f"delete-{project_dir.name}",
+                daemon=True,
+            ).start()
+            return True
+
         # Use onerror callback to handle readonly files on Windows
         shutil.rmtree(project_dir, onerror=FileSystemService._handle_remove_readonly)
         return True
 
+    @staticmethod
+    def _remove_trash_dirs(trash_dirs: List[Path]) -> None:
+        """Remove renamed-away project directories; runs in a background thread, so failures are logged"""
+        for trash_dir in trash_dirs:
+            try:
+                shutil.rmtree(trash_dir, onerror=FileSystemService._handle_remove_readonly)
+            except Exception as e:
+                logger.error(f"❌ Failed to remove deleted project directory {trash_dir}: {e}")
+
+    @staticmethod
+    def cleanup_trash() -> None:
+        """Remove trash directories left behind when the process exited in the middle of a delete"""
+        try:
+            with os.scandir(settings.PROJECTS_BASE_DIR) as entries:
+                leftovers = [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.startswith(_TRASH_PREFIX) and entry.is_dir(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            return
+
+        if leftovers:
+            logger.info(f"🧹 Removing {len(leftovers)} leftover deleted project directories")
+            threading.Thread(
+                target=FileSystemService._remove_trash_dirs, args=(leftovers,), name="cleanup-trash", daemon=True
+            ).start()
+
     @staticmethod
     def get_all_files(project_id: int) -> List[Dict[str, str]]:
         """Get all files in a project as a list of {path, content} dicts"""
@@ -334,54 +547,20 @@ code {
         if not project_dir.exists():
             return []
 
-        # Directories to exclude from bundle (node_modules, .git, build artifacts, etc.)
-        excluded_dirs = {
-            "node_modules",
-            ".git",
-            "dist",
-            "build",
-            ".vite",
-            "coverage",
-            ".turbo",
-            ".next",
-            ".cache",
-            "__pycache__",
-            ".pytest_cache",
-            ".mypy_cache",
-        }
-
-        # File patterns to exclude
-        excluded_files = {
-            ".DS_Store",
-            "Thumbs.db",
-            ".env",
-            ".env.local",
-            "package-lock.json",
-            "yarn.lock",
-            "pnpm-lock.yaml",
-        }
-
-        files = []
-        for file_path in project_dir.rglob("*"):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(project_dir)
-
-                # Check if file is in an excluded directory
-                if any(excluded_dir in relative_path.parts for excluded_dir in excluded_dirs):
-                    continue
+        entries = list(_iter_project_files(project_dir, _EXCLUDED_FILES))
+        contents = _read_pool.map(_read_text, [entry.path for entry, _ in entries])
 
-                # Check if file name is excluded
-                if file_path.name in excluded_files:
-                    continue
+        # Binary files or files that can't be read come back as None and are skipped
+        return [
+            {"path": relative_path, "content": content}
+            for (_, relative_path), content in zip(entries, contents)
+            if content is not None
+        ]
 
-                try:
-                    content = file_path.read_text(encoding="utf-8")
-                    files.append({"path": str(relative_path).replace("\\", "/"), "content": content})
-                except Exception:
-                    # Skip binary files or files that can't be read
-                    pass
-
-        return files
+    @staticmethod
+    def file_id(filepath: str) -> int:
+        """Stable positive ID for a project file, derived from its path (files are not DB rows)"""
+        return zlib.crc32(filepath.encode("utf-8")) & 0x7FFFFFFF or 1
 
     @staticmethod
     def get_all_project_files(project_id: int) -> List[Dict]:
@@ -394,96 +573,57 @@ code {
         if not project_dir.exists():
             return []
 
-        # Directories to exclude
-        excluded_dirs = {
-            "node_modules",
-            ".git",
-            "dist",
-            "build",
-            ".vite",
-            "coverage",
-            ".turbo",
-            ".next",
-            ".cache",
-            "__pycache__",
-            ".pytest_cache",
-            ".mypy_cache",
-        }
-
-        # Files to exclude
-        excluded_files = {
-            ".DS_Store",
-            "Thumbs.db",
-            ".env",
-            ".env.local",
-            "package-lock.json",
-            "yarn.lock",
-            "pnpm-lock.yaml",
-            ".gitignore",
-            ".browser_logs.json",
-            ".agent_state.json",
-        }
-
-        # Language mapping by extension
-        language_map = {
-            ".tsx": "tsx",
-            ".ts": "typescript",
-            ".jsx": "jsx",
-            ".js": "javascript",
-            ".css": "css",
-            ".html": "html",
-            ".json": "json",
-            ".md": "markdown",
-            ".py": "python",
-            ".yml": "yaml",
-            ".yaml": "yaml",
-        }
-
-        files = []
-        file_id = 1  # Generate sequential IDs for frontend
+        # Same order as sorting the paths component by component
+        entries = sorted(
+            _iter_project_files(project_dir, _EXCLUDED_EDITOR_FILES), key=lambda item: item[1].split("/")
+        )
 
-        for file_path in sorted(project_dir.rglob("*")):
-            if not file_path.is_file():
+        # Get file timestamps from filesystem, reusing cached content of files whose stat is unchanged
+        with _listing_lock:
+            cached = _listing_cache.get(project_id, {})
+        snapshot = {}
+        stale = []
+        for entry, filepath_str in entries:
+            try:
+                file_stat = entry.stat()
+            except OSError:
                 continue
+            key = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ctime_ns)
+            previous = cached.get(filepath_str)
+            if previous is not None and previous[:3] == key:
+                snapshot[filepath_str] = previous
+            else:
+                stale.append((entry, filepath_str, key))
+
+        for (entry, filepath_str, key), content in zip(
+            stale, _read_pool.map(_read_text, [item[0].path for item in stale])
+        ):
+            snapshot[filepath_str] = (*key, content)
+        with _listing_lock:
+            _listing_cache[project_id] = snapshot
+            _listing_cache.move_to_end(project_id)
+            if len(_listing_cache) > _LISTING_CACHE_SIZE:
+                _listing_cache.popitem(last=False)
 
-            relative_path = file_path.relative_to(project_dir)
-
-            # Check if file is in an excluded directory
-            if any(excluded_dir in relative_path.parts for excluded_dir in excluded_dirs):
-                continue
+        files = []
+        for entry, filepath_str in entries:
+            mtime_ns, _, ctime_ns, content = snapshot.get(filepath_str, (0, 0, 0, None))
 
-            # Check if file name is excluded
-            if file_path.name in excluded_files:
+            # Skip binary files or files that can't be read
+            if content is None:
                 continue
 
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                filepath_str = str(relative_path).replace("\\", "/")
-                extension = file_path.suffix
-                language = language_map.get(extension, "text")
-
-                # Get file timestamps from filesystem
-                from datetime import datetime
-
-                stat = file_path.stat()
-                created_at = datetime.fromtimestamp(stat.st_ctime)
-                updated_at = datetime.fromtimestamp(stat.st_mtime)
-
-                files.append(
-                    {
-                        "id": file_id,
-                        "project_id": project_id,
-                        "filename": file_path.name,
-                        "filepath": filepath_str,
-                        "content": content,
-                        "language": language,
-                        "created_at": created_at,
-                        "updated_at": updated_at,
-                    }
-                )
-                file_id += 1
-            except Exception:
-                # Skip binary files or files that can't be read
-                pass
+            files.append(
+                {
+                    "id": FileSystemService.file_id(filepath_str),
+                    "project_id": project_id,
+                    "filename": entry.name,
+                    "filepath": filepath_str,
+                    "content": content,
+                    "language": _LANGUAGE_MAP.get(os.path.splitext(entry.name)[1], "text"),
+                    "created_at": datetime.fromtimestamp(ctime_ns / 1e9),
+                    "updated_at": datetime.fromtimestamp(mtime_ns / 1e9),
+                }
+            )
 
         return files
@@ -4,9 +4,9 @@ import os
 from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm import Session, defer, selectinload
 
-from app.models import Project, ProjectFile
+from app.models import ChatMessage, ChatSession, Project, ProjectFile
 from app.schemas import ProjectCreate, ProjectFileCreate, ProjectUpdate
 from app.services.filesystem_service import FileSystemService
 
@@ -90,7 +90,23 @@ class ProjectService:
     def delete_project(db: Session, project_id: int, owner_id: int) -> bool:
         """Delete a project"""
 
-        project = ProjectService.get_project(db, project_id, owner_id)
+        # The delete cascades to files, sessions and messages; load them up front with one
+        # query per table (primary keys only) instead of lazily per session
+        project = (
+            db.query(Project)
+            .filter(Project.id == project_id, Project.owner_id == owner_id)
+            .options(
+                selectinload(Project.files).load_only(ProjectFile.id),
+                selectinload(Project.chat_sessions)
+                .load_only(ChatSession.id)
+                .selectinload(ChatSession.messages)
+                .load_only(ChatMessage.id),
+            )
+            .first()
+        )
+
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
         # Delete physical files
         FileSystemService.delete_project(project_id)
@@ -143,8 +159,18 @@ class ProjectService:
         file_dict = file_data.model_dump()
         file_dict.pop("content", None)  # Remove content if present
 
-        db_file = ProjectFile(**file_dict)
-        db.add(db_file)
+        # Upsert on (project_id, filepath), which is unique
+        db_file = (
+            db.query(ProjectFile)
+            .filter(ProjectFile.project_id == file_dict["project_id"], ProjectFile.filepath == file_dict["filepath"])
+            .one_or_none()
+        )
+        if db_file:
+            for key, value in file_dict.items():
+                setattr(db_file, key, value)
+        else:
+            db_file = ProjectFile(**file_dict)
+            db.add(db_file)
         db.commit()
         db.refresh(db_file)
 
@@ -0,0 +1,58 @@
+"""
+Agent Tool Workspace Tests
+
+Agent tools resolve relative paths against the per-turn workspace set with
+set_workspace(), never against the server's working directory.
+
+Run with: pytest backend/tests/test_agent_tools.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.agents.tools.common import reset_workspace, set_workspace
+from app.agents.tools.delete_file import delete_file
+from app.agents.tools.json_tools import json_get_value, read_json
+from app.agents.tools.write_file import write_file
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Project workspace, with the process cwd pointed at a different directory holding decoy files"""
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    (server_dir / "package.json").write_text('{"name": "backend"}', encoding="utf-8")
+    monkeypatch.chdir(server_dir)
+
+    token = set_workspace(project_dir)
+    yield project_dir
+    reset_workspace(token)
+
+
+def test_read_json_uses_workspace(workspace):
+    """JSON tools read the project's file, not the one in the server cwd"""
+    (workspace / "package.json").write_text('{"name": "workspace-project"}', encoding="utf-8")
+
+    data = asyncio.run(read_json("package.json"))
+    value = asyncio.run(json_get_value("package.json", "name"))
+
+    assert data == {"name": "workspace-project"}
+    assert value == "Value at 'name': \"workspace-project\""
+
+
+def test_write_and_delete_file_use_workspace(workspace):
+    """write_file/delete_file create and remove relative paths inside the workspace"""
+    result = asyncio.run(write_file("src/notes/todo.txt", "ship it"))
+
+    target = workspace / "src" / "notes" / "todo.txt"
+    assert result.startswith("Successfully wrote")
+    assert target.read_text(encoding="utf-8") == "ship it"
+    assert not (workspace.parent / "server" / "src").exists()
+
+    result = asyncio.run(delete_file("src/notes/todo.txt"))
+
+    assert result == "Successfully deleted file: src/notes/todo.txt"
+    assert not target.exists()
@@ -13,7 +13,9 @@ from fastapi.testclient import TestClient
 from app.core.security import get_password_hash
 from app.db.database import Base, SessionLocal, engine
 from app.main import app
-from app.models import User
+from app.models import ChatMessage, MessageRole, User
+from app.schemas import ChatRequest
+from app.services import ChatService
 
 # Create test client
 client = TestClient(app)
@@ -203,6 +205,93 @@ class TestChatAPI:
             assert "response" in data
             assert "session_id" in data
 
+    def test_send_whitespace_message_rejected(self, project_id):
+        """Test that a message with no text and no attachments is rejected with 400"""
+        for url in (f"/api/v1/chat/{project_id}", f"/api/v1/chat/{project_id}/stream"):
+            response = client.post(url, json={"message": "   \n\t "})
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Message cannot be empty"
+
+    def test_empty_message_with_attachments_accepted(self):
+        """Test that an attachment alone is enough for a chat request"""
+        chat_request = ChatRequest(
+            message="",
+            attachments=[{"type": "image", "mime_type": "image/png", "data": "iVBORw0KGgo=", "name": "shot.png"}],
+        )
+
+        # Does not raise
+        ChatService.validate_chat_request(chat_request)
+
+    def test_reconnect_returns_messages_after_since_id(self, project_id):
+        """Test reconnecting to a session returns only newer messages, in id order, plus the session total"""
+        session_response = client.post(
+            f"/api/v1/chat/{project_id}/sessions", json={"project_id": project_id, "title": "Reconnect"}
+        )
+        assert session_response.status_code == 201
+        session_id = session_response.json()["id"]
+
+        # Seed messages directly in the database
+        db = SessionLocal()
+        try:
+            messages = [
+                ChatMessage(session_id=session_id, role=MessageRole.USER, content="first"),
+                ChatMessage(
+                    session_id=session_id,
+                    role=MessageRole.ASSISTANT,
+                    content="second",
+                    agent_name="Coder",
+                    message_metadata='{"agent_interactions": [{"agent_name": "Coder"}]}',
+                ),
+                ChatMessage(session_id=session_id, role=MessageRole.USER, content="third"),
+            ]
+            db.add_all(messages)
+            db.commit()
+            message_ids = [message.id for message in messages]
+        finally:
+            db.close()
+
+        response = client.get(
+            f"/api/v1/chat/{project_id}/sessions/{session_id}/reconnect",
+            params={"since_message_id": message_ids[0]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["session_id"] == session_id
+        assert data["project_id"] == project_id
+        assert data["total_messages"] == 3
+        assert data["has_more"] is True
+        assert [message["id"] for message in data["new_messages"]] == message_ids[1:]
+
+        # Same shape as ChatMessage.from_db_message(...).model_dump(mode="json")
+        assistant = data["new_messages"][0]
+        assert set(assistant) == {
+            "id",
+            "session_id",
+            "role",
+            "content",
+            "agent_name",
+            "message_metadata",
+            "created_at",
+            "agent_interactions",
+            "attachments",
+        }
+        assert assistant["role"] == "assistant"
+        assert assistant["content"] == "second"
+        assert assistant["agent_interactions"] == [{"agent_name": "Coder"}]
+        assert assistant["attachments"] is None
+        assert assistant["created_at"].endswith("+00:00")
+
+        # Nothing newer than the last message
+        response = client.get(
+            f"/api/v1/chat/{project_id}/sessions/{session_id}/reconnect",
+            params={"since_message_id": message_ids[-1]},
+        )
+        data = response.json()
+        assert data["new_messages"] == []
+        assert data["total_messages"] == 3
+        assert data["has_more"] is False
+
     def test_list_sessions(self, project_id):
         """Test listing chat sessions"""
         response = client.get(f"/api/v1/chat/{project_id}/sessions")
@@ -0,0 +1,45 @@
+"""
+Database Initialization Tests
+
+Run with: pytest backend/tests/test_database.py
+"""
+
+from sqlalchemy import create_engine, inspect, insert, select, text
+
+import app.models  # noqa: F401 - registers the tables on Base.metadata
+from app.db import database
+from app.db.database import Base, init_db
+
+
+def test_init_db_dedupes_project_files_before_unique_index(tmp_path, monkeypatch):
+    """Databases created before uq_project_filepath keep only the newest row per (project_id, filepath)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+
+    # Recreate an old database: same tables, no unique index, duplicate rows
+    Base.metadata.create_all(bind=engine)
+    project_files = Base.metadata.tables["project_files"]
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX uq_project_filepath"))
+        conn.execute(
+            insert(project_files),
+            [
+                {"id": 1, "project_id": 1, "filename": "App.tsx", "filepath": "src/App.tsx"},
+                {"id": 2, "project_id": 1, "filename": "index.html", "filepath": "index.html"},
+                {"id": 3, "project_id": 1, "filename": "App.tsx", "filepath": "src/App.tsx"},
+                {"id": 4, "project_id": 2, "filename": "App.tsx", "filepath": "src/App.tsx"},
+                {"id": 5, "project_id": 1, "filename": "App.tsx", "filepath": "src/App.tsx"},
+            ],
+        )
+
+    init_db()
+
+    with engine.connect() as conn:
+        remaining = conn.execute(select(project_files.c.id).order_by(project_files.c.id)).scalars().all()
+    assert remaining == [2, 4, 5]
+
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("project_files")}
+    assert "uq_project_filepath" in indexes
+    assert indexes["uq_project_filepath"]["unique"]
+
+    engine.dispose()
@@ -0,0 +1,52 @@
+"""
+FileSystemService Tests
+
+Run with: pytest backend/tests/test_filesystem_service.py
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services import filesystem_service
+from app.services.filesystem_service import FileSystemService
+
+PROJECT_ID = 424242
+
+
+@pytest.fixture(autouse=True)
+def projects_dir(tmp_path, monkeypatch):
+    """Point the service at a temporary projects directory"""
+    monkeypatch.setattr(settings, "PROJECTS_BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(filesystem_service, "_project_dirs", {})
+    yield tmp_path
+    filesystem_service._listing_cache.pop(PROJECT_ID, None)
+
+
+def _contents(project_id):
+    return {f["filepath"]: f["content"] for f in FileSystemService.get_all_project_files(project_id)}
+
+
+def test_listing_sees_rewritten_files():
+    """A file rewritten through write_file is re-read instead of served from the listing cache"""
+    FileSystemService.write_file(PROJECT_ID, "src/App.tsx", "export default 1")
+    FileSystemService.write_file(PROJECT_ID, "README.md", "# readme")
+
+    assert _contents(PROJECT_ID) == {"README.md": "# readme", "src/App.tsx": "export default 1"}
+    assert PROJECT_ID in filesystem_service._listing_cache
+
+    FileSystemService.write_file(PROJECT_ID, "src/App.tsx", "export default function App() {}")
+    FileSystemService.delete_file(PROJECT_ID, "README.md")
+
+    assert _contents(PROJECT_ID) == {"src/App.tsx": "export default function App() {}"}
+
+
+def test_delete_project_clears_listing_cache():
+    """delete_project drops the cached listing of the project"""
+    FileSystemService.write_file(PROJECT_ID, "src/App.tsx", "export default 1")
+    FileSystemService.get_all_project_files(PROJECT_ID)
+    assert PROJECT_ID in filesystem_service._listing_cache
+
+    assert FileSystemService.delete_project(PROJECT_ID) is True
+
+    assert PROJECT_ID not in filesystem_service._listing_cache
+    assert FileSystemService.get_all_project_files(PROJECT_ID) == []